@@ -1,20 +1,24 @@
 import os
 import shutil
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, status, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, status, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 from app.core.database import get_db
 from app.core.config import settings
 from app.core.security import get_current_user
 from app.models.video import (
-    Video, DetectedObject, ExtractedText, VideoStatus,
+    Video, DetectedObject, ObjectTrack, ExtractedText, VideoStatus,
     VideoUploadResponse, VideoProcessingResult, VideoStatusResponse,
-    BoundingBox, DetectedObjectResponse, ExtractedTextResponse
+    BoundingBox, DetectedObjectResponse, ObjectTrackResponse, ExtractedTextResponse
 )
 from app.services.video_processing import VideoProcessingService
+from app.services.ocr_preprocessing import OCR_PREPROCESSING_STEPS, parse_preprocessing
+from app.services.text_regions import parse_rois
 from app.services.export_service import ExportService
+from app.services.progress import ProgressReporter, TERMINAL_STATUSES, read_progress
 from app.tasks.video_tasks import process_video_task
 import logging
 
@@ -25,6 +29,15 @@ router = APIRouter(prefix="/video", tags=["Video Processing"])
 # Allowed video formats
 ALLOWED_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv'}
 MAX_FILE_SIZE = 500 * 1024 * 1024  # 500MB
+MAX_IMGSZ = 4096
+
+# Messages reported for each status
+STATUS_MESSAGES = {
+    VideoStatus.UPLOADED: "Video uploaded, waiting to be processed",
+    VideoStatus.PROCESSING: "Processing video frames and extracting data",
+    VideoStatus.COMPLETED: "Processing completed successfully",
+    VideoStatus.FAILED: "Processing failed"
+}
 
 
 def validate_video_file(filename: str, file_size: int):
@@ -44,9 +57,54 @@ def validate_video_file(filename: str, file_size: int):
         )
 
 
+def parse_imgsz(imgsz: Optional[str]) -> Optional[str]:
+    """Validate the detection image size job parameter: pixels or 'auto'."""
+    if not imgsz:
+        return None
+    
+    imgsz = imgsz.strip().lower()
+    if imgsz == 'auto' or (imgsz.isdigit() and 32 <= int(imgsz) <= MAX_IMGSZ):
+        return imgsz
+    
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Invalid imgsz. Use 'auto' or a size between 32 and {MAX_IMGSZ} pixels"
+    )
+
+
+def validate_ocr_preprocessing(ocr_preprocessing: Optional[str]) -> Optional[str]:
+    """Validate the OCR preprocessing job parameter: comma-separated step names."""
+    if ocr_preprocessing is None:
+        return None
+    
+    try:
+        return ','.join(parse_preprocessing(ocr_preprocessing))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{str(e)}. Available steps: {', '.join(OCR_PREPROCESSING_STEPS)}"
+        )
+
+
+def validate_ocr_rois(ocr_rois: Optional[str]) -> Optional[str]:
+    """Validate the OCR regions-of-interest job parameter: 'auto' or 'x,y,w,h;...' in 0-1."""
+    if ocr_rois is None:
+        return None
+    
+    try:
+        parse_rois(ocr_rois)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return ocr_rois.strip()
+
+
 @router.post("/upload", response_model=VideoUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_video(
     file: UploadFile = File(...),
+    imgsz: Optional[str] = Form(None),
+    ocr_preprocessing: Optional[str] = Form(None),
+    ocr_rois: Optional[str] = Form(None),
+    chunked: Optional[bool] = Form(None),
     background_tasks: BackgroundTasks = None,
     db: Session = Depends(get_db),
     current_user: Dict = Depends(get_current_user)
@@ -59,6 +117,14 @@ async def upload_video(
     - YOLO object detection will be applied
     - OCR text extraction will be performed
     
+    `imgsz` optionally sets the detection image size in pixels, or 'auto' to
+    pick it from the video resolution. `ocr_preprocessing` optionally sets the
+    OCR preprocessing steps, e.g. 'normalize,binarize' ('' for none).
+    `ocr_rois` optionally limits OCR to normalized rectangles, e.g.
+    '0,0.8,1,0.2' for a subtitle band, or 'auto' to find the text bands.
+    `chunked` optionally splits the video into subtasks that run on any
+    worker and are merged at the end (default from settings).
+    
     Returns a video_id to track processing status.
     """
     try:
@@ -69,10 +135,12 @@ async def upload_video(
         
         # Validate file
         validate_video_file(file.filename, file_size)
+        imgsz = parse_imgsz(imgsz)
+        ocr_preprocessing = validate_ocr_preprocessing(ocr_preprocessing)
+        ocr_rois = validate_ocr_rois(ocr_rois)
         
         # Generate unique video ID
-        video_service = VideoProcessingService()
-        video_id = video_service.generate_video_id()
+        video_id = VideoProcessingService.generate_video_id()
         
         # Create upload directory
         upload_dir = Path(settings.video_upload_dir)
@@ -97,9 +165,22 @@ async def upload_video(
         db.add(video)
         db.commit()
         db.refresh(video)
+        # The reporter's Redis client is synchronous, so keep it off the event loop
+        await run_in_threadpool(
+            ProgressReporter(video_id).start, 0, stage='queued', status=VideoStatus.UPLOADED.value
+        )
         
         # Queue video processing task
-        process_video_task.delay(video_id, str(video_path), frame_interval=1)
+        options = {}
+        if imgsz:
+            options['imgsz'] = imgsz
+        if ocr_preprocessing is not None:
+            options['ocr_preprocessing'] = ocr_preprocessing
+        if ocr_rois is not None:
+            options['ocr_rois'] = ocr_rois
+        if chunked is not None:
+            options['chunked'] = chunked
+        process_video_task.delay(video_id, str(video_path), frame_interval=1, options=options)
         
         logger.info(f"Video uploaded successfully: {video_id}")
         
@@ -110,7 +191,7 @@ async def upload_video(
             status=VideoStatus.UPLOADED,
             message="Video uploaded successfully. Processing started in background."
         )
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -130,9 +211,32 @@ async def get_video_status(
     """
     Get the processing status of a video.
     
-    Returns the current status and progress information.
+    Returns the current status and progress information. Queued and running
+    jobs are answered from their Redis progress hash without a database
+    query; terminal states (and jobs without progress) come from the database.
     Requires authentication.
     """
+    job_progress = await read_progress(video_id)
+    # A job still running when its video was deleted can recreate the hash
+    # without a status; that is no live job
+    if job_progress and job_progress.get('status') and job_progress['status'] not in TERMINAL_STATUSES:
+        frames_total = job_progress['frames_total']
+        percent = 0
+        if frames_total:
+            # 100 only once results are saved and the database says completed
+            percent = min(99.0, round(100 * job_progress['frames_done'] / frames_total, 1))
+        return VideoStatusResponse(
+            video_id=video_id,
+            status=job_progress['status'],
+            progress=percent,
+            message=STATUS_MESSAGES.get(job_progress['status'], "Unknown status"),
+            stage=job_progress.get('stage'),
+            frames_done=job_progress['frames_done'],
+            frames_total=frames_total,
+            fps=job_progress['fps'],
+            eta_seconds=job_progress['eta_seconds']
+        )
+    
     video = db.query(Video).filter(Video.video_id == video_id).first()
     
     if not video:
@@ -146,25 +250,17 @@ async def get_video_status(
     if video.status == VideoStatus.UPLOADED:
         progress = 0
     elif video.status == VideoStatus.PROCESSING:
-        progress = 50
+        progress = None  # no progress published (yet)
     elif video.status == VideoStatus.COMPLETED:
         progress = 100
     elif video.status == VideoStatus.FAILED:
         progress = 0
     
-    # Status message
-    status_messages = {
-        VideoStatus.UPLOADED: "Video uploaded, waiting to be processed",
-        VideoStatus.PROCESSING: "Processing video frames and extracting data",
-        VideoStatus.COMPLETED: "Processing completed successfully",
-        VideoStatus.FAILED: "Processing failed"
-    }
-    
     return VideoStatusResponse(
         video_id=video_id,
         status=video.status,
         progress=progress,
-        message=status_messages.get(video.status, "Unknown status"),
+        message=STATUS_MESSAGES.get(video.status, "Unknown status"),
         error_message=video.error_message
     )
 
@@ -181,8 +277,13 @@ async def get_video_results(
     Returns:
     - Video metadata
     - Detected objects with bounding boxes
+    - Object tracks (when tracking was enabled for the job)
     - Extracted text from frames
     
+    While the video is processing, returns the results stored so far;
+    they are written in batches as frames are processed. Tracks are only
+    available once processing has completed.
+    
     Requires authentication.
     """
     # Get video
@@ -194,16 +295,16 @@ async def get_video_results(
             detail="Video not found"
         )
     
-    if video.status != VideoStatus.COMPLETED:
+    if video.status not in (VideoStatus.COMPLETED, VideoStatus.PROCESSING):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Video processing not completed yet. Current status: {video.status}"
         )
     
-    # Get detected objects
+    # Get detected objects (segments of a job may write them out of order)
     detected_objects = db.query(DetectedObject).filter(
         DetectedObject.video_id == video_id
-    ).all()
+    ).order_by(DetectedObject.frame_number, DetectedObject.id).all()
     
     detected_objects_response = [
         DetectedObjectResponse(
@@ -221,10 +322,35 @@ async def get_video_results(
         for obj in detected_objects
     ]
     
+    # Get object tracks
+    object_tracks = db.query(ObjectTrack).filter(
+        ObjectTrack.video_id == video_id
+    ).order_by(ObjectTrack.track_id).all()
+    
+    object_tracks_response = [
+        ObjectTrackResponse(
+            track_id=track.track_id,
+            object_class=track.object_class,
+            first_frame=track.first_frame,
+            last_frame=track.last_frame,
+            first_timestamp=track.first_timestamp,
+            last_timestamp=track.last_timestamp,
+            detection_count=track.detection_count,
+            peak_confidence=track.peak_confidence,
+            bbox=BoundingBox(
+                x1=track.bbox_x1,
+                y1=track.bbox_y1,
+                x2=track.bbox_x2,
+                y2=track.bbox_y2
+            )
+        )
+        for track in object_tracks
+    ]
+    
     # Get extracted texts
     extracted_texts = db.query(ExtractedText).filter(
         ExtractedText.video_id == video_id
-    ).all()
+    ).order_by(ExtractedText.frame_number, ExtractedText.id).all()
     
     extracted_texts_response = [
         ExtractedTextResponse(
@@ -239,6 +365,7 @@ async def get_video_results(
     # Calculate total frames
     total_frames = max(
         max((obj.frame_number for obj in detected_objects), default=0),
+        max((track.last_frame for track in object_tracks), default=0),
         max((text.frame_number for text in extracted_texts), default=0)
     ) + 1
     
@@ -250,6 +377,7 @@ async def get_video_results(
         fps=video.fps,
         total_frames=total_frames,
         detected_objects=detected_objects_response,
+        object_tracks=object_tracks_response,
         extracted_texts=extracted_texts_response,
         error_message=video.error_message,
         created_at=video.created_at,
@@ -270,6 +398,7 @@ async def delete_video(
     - Video file
     - Extracted frames
     - Database records
+    - Job progress in Redis
     
     Requires authentication.
     """
@@ -287,22 +416,25 @@ async def delete_video(
             os.remove(video.file_path)
         
         # Delete frames
-        video_service = VideoProcessingService()
-        video_service.cleanup_frames(video_id)
+        VideoProcessingService.cleanup_frames(video_id)
         
         # Delete database records
         db.query(DetectedObject).filter(DetectedObject.video_id == video_id).delete()
+        db.query(ObjectTrack).filter(ObjectTrack.video_id == video_id).delete()
         db.query(ExtractedText).filter(ExtractedText.video_id == video_id).delete()
         db.query(Video).filter(Video.video_id == video_id).delete()
         db.commit()
         
+        # Otherwise the status endpoint keeps answering from Redis for a queued or running job
+        await run_in_threadpool(ProgressReporter(video_id).finish)
+        
         logger.info(f"Video {video_id} deleted successfully")
         
         return {
             "message": "Video and all associated data deleted successfully",
             "video_id": video_id
         }
-        
+    
     except Exception as e:
         logger.error(f"Failed to delete video {video_id}: {str(e)}")
         raise HTTPException(
@@ -383,6 +515,10 @@ async def export_video_text(
             DetectedObject.video_id == video_id
         ).order_by(DetectedObject.frame_number).all()
         
+        object_tracks = db.query(ObjectTrack).filter(
+            ObjectTrack.video_id == video_id
+        ).order_by(ObjectTrack.track_id).all()
+        
         extracted_texts = db.query(ExtractedText).filter(
             ExtractedText.video_id == video_id
         ).order_by(ExtractedText.frame_number).all()
@@ -394,7 +530,8 @@ async def export_video_text(
             video_filename=video.filename,
             detected_objects=detected_objects,
             extracted_texts=extracted_texts,
-            status=video.status
+            status=video.status,
+            object_tracks=object_tracks
         )
         
         # Return file download
@@ -406,7 +543,7 @@ async def export_video_text(
                 "Content-Disposition": f"attachment; filename={os.path.basename(file_path)}"
             }
         )
-        
+    
     except Exception as e:
         logger.error(f"Failed to export text for video {video_id}: {str(e)}")
         raise HTTPException(
@@ -453,6 +590,10 @@ async def export_video_pdf(
             DetectedObject.video_id == video_id
         ).order_by(DetectedObject.frame_number).all()
         
+        object_tracks = db.query(ObjectTrack).filter(
+            ObjectTrack.video_id == video_id
+        ).order_by(ObjectTrack.track_id).all()
+        
         extracted_texts = db.query(ExtractedText).filter(
             ExtractedText.video_id == video_id
         ).order_by(ExtractedText.frame_number).all()
@@ -464,7 +605,8 @@ async def export_video_pdf(
             video_filename=video.filename,
             detected_objects=detected_objects,
             extracted_texts=extracted_texts,
-            status=video.status
+            status=video.status,
+            object_tracks=object_tracks
         )
         
         # Return file download
@@ -476,7 +618,7 @@ async def export_video_pdf(
                 "Content-Disposition": f"attachment; filename={os.path.basename(file_path)}"
             }
         )
-        
+    
     except Exception as e:
         logger.error(f"Failed to export PDF for video {video_id}: {str(e)}")
         raise HTTPException(
@@ -497,6 +639,7 @@ async def export_video_json(
     Returns structured JSON with:
     - Video metadata
     - Array of detected objects
+    - Array of object tracks (when tracking was on)
     - Array of extracted texts
     - Processing statistics
     
@@ -523,6 +666,10 @@ async def export_video_json(
             DetectedObject.video_id == video_id
         ).order_by(DetectedObject.frame_number).all()
         
+        object_tracks = db.query(ObjectTrack).filter(
+            ObjectTrack.video_id == video_id
+        ).order_by(ObjectTrack.track_id).all()
+        
         extracted_texts = db.query(ExtractedText).filter(
             ExtractedText.video_id == video_id
         ).order_by(ExtractedText.frame_number).all()
@@ -536,7 +683,8 @@ async def export_video_json(
             extracted_texts=extracted_texts,
             status=video.status,
             duration=video.duration,
-            fps=video.fps
+            fps=video.fps,
+            object_tracks=object_tracks
         )
         
         # Return file download
@@ -548,7 +696,7 @@ async def export_video_json(
                 "Content-Disposition": f"attachment; filename={os.path.basename(file_path)}"
             }
         )
-        
+    
     except Exception as e:
         logger.error(f"Failed to export JSON for video {video_id}: {str(e)}")
         raise HTTPException(
@@ -568,6 +716,7 @@ async def export_video_csv(
     
     Returns CSV with separate sections for:
     - Detected objects (frame, timestamp, class, confidence, bbox)
+    - Object tracks (when tracking was on)
     - Extracted texts (frame, timestamp, text, confidence)
     
     Requires authentication.
@@ -593,6 +742,10 @@ async def export_video_csv(
             DetectedObject.video_id == video_id
         ).order_by(DetectedObject.frame_number).all()
         
+        object_tracks = db.query(ObjectTrack).filter(
+            ObjectTrack.video_id == video_id
+        ).order_by(ObjectTrack.track_id).all()
+        
         extracted_texts = db.query(ExtractedText).filter(
             ExtractedText.video_id == video_id
         ).order_by(ExtractedText.frame_number).all()
@@ -603,7 +756,8 @@ async def export_video_csv(
             video_id=video_id,
             video_filename=video.filename,
             detected_objects=detected_objects,
-            extracted_texts=extracted_texts
+            extracted_texts=extracted_texts,
+            object_tracks=object_tracks
         )
         
         # Return file download
@@ -615,7 +769,7 @@ async def export_video_csv(
                 "Content-Disposition": f"attachment; filename={os.path.basename(file_path)}"
             }
         )
-        
+    
     except Exception as e:
         logger.error(f"Failed to export CSV for video {video_id}: {str(e)}")
         raise HTTPException(
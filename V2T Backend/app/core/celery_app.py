@@ -1,5 +1,15 @@
 from celery import Celery
+from celery.signals import worker_init
 from app.core.config import settings
+from app.core.worker_topology import plan_topology, describe_topology
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cores are split between concurrent jobs from a single per-job budget
+topology = plan_topology(
+    settings.cores_per_job, settings.worker_concurrency, ocr_threads=settings.ocr_threads
+)
 
 # Initialize Celery
 celery_app = Celery(
@@ -19,4 +29,22 @@ celery_app.conf.update(
     task_time_limit=3600,  # 1 hour max per task
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=10,
+    worker_concurrency=topology['concurrency'],
+    # Children load and warm up YOLO before reporting ready; Celery's 4 s default
+    # would kill them first and keep restarting them
+    worker_proc_alive_timeout=settings.worker_init_timeout,
 )
+
+
+@worker_init.connect
+def log_worker_topology(sender=None, **kwargs):
+    """Report how the worker's cores are split between jobs."""
+    logger.info(f"Worker topology: {describe_topology(topology, settings.worker_cpu_affinity)}")
+    
+    # --concurrency on the command line overrides the planned value
+    concurrency = getattr(sender, 'concurrency', None)
+    if concurrency and concurrency != topology['concurrency']:
+        logger.warning(
+            f"Worker runs {concurrency} children but the topology plans {topology['concurrency']}; "
+            f"{concurrency * topology['cores_per_job']} of {topology['total_cores']} cores are budgeted"
+        )
@@ -32,7 +32,58 @@ class Settings(BaseSettings):
     video_frames_dir: str = "./uploads/frames"
     max_video_size_mb: int = 500
     frame_extraction_interval: int = 1  # seconds
+    frame_source: str = "opencv"  # opencv | ffmpeg (rawvideo pipe with decoder-side filters)
+    frame_sampling_strategy: str = "auto"  # auto | grab | seek (opencv source only)
+    decode_max_size: int = 0  # downscale frames to this longest side at decode time, OCR included (0 = source size)
+    save_extracted_frames: bool = False  # also write sampled frames to video_frames_dir
+    frame_sampling_mode: str = "fixed"  # fixed | adaptive (skip inference on unchanged frames) | keyframes
+    keyframe_min_spacing: float = 0.0  # seconds; keyframes mode drops keyframes closer than this
+    scene_change_threshold: float = 0.05  # min difference (0-1) to re-run inference
+    scene_change_max_gap: float = 30.0  # seconds; analyze at least one frame this often
+    scene_change_method: str = "absdiff"  # absdiff | histogram
+    yolo_weights: str = "yolov8n.pt"  # PyTorch weights; exported models are cached next to them
+    detection_backend: str = "pytorch"  # pytorch | onnx (onnxruntime) | openvino | torchscript
     yolo_confidence_threshold: float = 0.5
+    yolo_quantization: str = "none"  # none | dynamic | static (INT8 ONNX model run with onnxruntime)
+    quantization_calibration_path: str = ""  # video or image directory to calibrate static INT8 on
+    quantization_calibration_frames: int = 100  # frames drawn from the calibration source
+    yolo_batch_size: int = 8  # frames per YOLO inference call
+    yolo_imgsz: str = ""  # inference size in pixels, or auto; resizes only the detector input ("" = model default)
+    min_object_size: int = 32  # smallest object of interest in source pixels, bounds the auto image size
+    detection_cache: bool = False  # opt-in: reuse detections on near-identical frames (faster, can miss small changes)
+    detection_cache_threshold: float = 0.02  # max fraction of differing dHash bits to reuse detections
+    detection_cache_max_age: float = 10.0  # seconds; re-run detection at least this often (0 = no limit)
+    object_tracking: bool = False  # link detections across frames into object_tracks
+    tracking_iou_threshold: float = 0.3  # min overlap to continue a track
+    tracking_max_gap: float = 2.0  # seconds a track may go undetected before it ends
+    save_frame_detections: bool = True  # also store one detected_objects row per box per frame
+    ocr_engine: str = "auto"  # auto | tesserocr (persistent engines) | pytesseract (process per frame)
+    ocr_pool_size: int = 2  # persistent Tesseract engines per worker process
+    ocr_threads: int = 2  # OCR threads per job, overlapping OCR with decoding and detection
+    ocr_queue_size: int = 8  # OCR'd frames buffered for the in-order sink before OCR pauses
+    pipeline_queue_size: int = 2  # chunks buffered between the decode, detection and OCR stages
+    text_region_method: str = "gradient"  # none (OCR whole frames) | gradient | mser | east
+    east_model_path: str = ""  # frozen_east_text_detection.pb, needed for text_region_method=east
+    text_region_max_coverage: float = 0.5  # OCR the whole frame when regions cover more than this
+    ocr_preprocessing: str = ""  # comma-separated: grayscale, normalize, denoise, deskew, binarize
+    ocr_text_height: int = 30  # pixels; normalize rescales glyphs to about this height
+    ocr_cache: bool = True  # reuse OCR results for text regions that repeat across frames
+    ocr_cache_size: int = 256  # regions cached per job (least recently used are evicted)
+    ocr_rois: str = ""  # OCR only these normalized x,y,w,h rects (';'-separated), or auto; "" = whole frame
+    ocr_roi_sample_frames: int = 20  # frames sampled to find text bands for ocr_rois=auto
+    ocr_roi_min_presence: float = 0.3  # fraction of sampled frames a band must hold text in
+    cores_per_job: int = 4  # core budget per video job: torch threads, OMP_THREAD_LIMIT (0 = all cores)
+    worker_concurrency: int = 0  # Celery child processes (0 = available cores // cores_per_job)
+    worker_cpu_affinity: bool = False  # pin each Celery child to its own block of cores_per_job cores
+    worker_init_timeout: float = 300.0  # seconds a Celery child may spend loading and warming up models
+    processing_workers: int = 1  # processes decoding and analyzing segments of one video
+    min_segment_seconds: float = 60.0  # don't split videos into segments shorter than this
+    chunked_processing: bool = False  # split videos into Celery subtasks any worker can run, then merge
+    chunk_seconds: float = 600.0  # video time per subtask in chunked mode
+    progress_interval: float = 1.0  # seconds between job progress updates to Redis
+    progress_ttl: int = 86400  # seconds a stalled job's progress hash is kept in Redis
+    progress_redis_timeout: float = 0.5  # seconds; progress is skipped rather than waited for
+    result_batch_frames: int = 100  # frames per database write during processing (0 = write all results at the end)
     
     # Celery / Redis
     redis_url: str = "redis://localhost:6379/0"
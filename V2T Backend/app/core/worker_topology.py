@@ -0,0 +1,101 @@
+import os
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def available_cores() -> List[int]:
+    """CPU ids this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_topology(
+    cores_per_job: int = 4,
+    concurrency: int = 0,
+    total_cores: Optional[int] = None,
+    ocr_threads: int = 1
+) -> Dict:
+    """
+    Split the machine's cores between concurrent jobs.
+    
+    Each job (Celery child) gets a budget of cores_per_job cores, which
+    bounds both torch's intra-op threads and Tesseract's OpenMP threads, so
+    concurrent jobs don't oversubscribe the CPU. The OpenMP budget is shared
+    by the job's OCR threads, which run Tesseract concurrently.
+    
+    Args:
+        cores_per_job: Cores budgeted per video job (clamped to the machine)
+        concurrency: Celery child processes (0 = as many as the cores allow)
+        total_cores: Cores to plan for (default: the cores available to this process)
+        ocr_threads: Concurrent OCR threads per job
+    
+    Returns:
+        Dictionary with total_cores, cores_per_job, concurrency,
+        torch_threads, ocr_threads and omp_thread_limit
+    """
+    total_cores = total_cores or len(available_cores())
+    cores_per_job = max(1, min(cores_per_job or total_cores, total_cores))
+    concurrency = concurrency or max(1, total_cores // cores_per_job)
+    ocr_threads = max(1, ocr_threads)
+    
+    return {
+        'total_cores': total_cores,
+        'cores_per_job': cores_per_job,
+        'concurrency': concurrency,
+        'torch_threads': cores_per_job,
+        'ocr_threads': ocr_threads,
+        'omp_thread_limit': max(1, cores_per_job // ocr_threads)
+    }
+
+
+def apply_thread_limits(threads: int, omp_thread_limit: Optional[int] = None):
+    """
+    Limit this process's inference and OCR threads.
+    
+    OMP_THREAD_LIMIT (default: threads) is read by every Tesseract subprocess
+    started afterwards; OMP_NUM_THREADS and torch.set_num_threads cover the
+    detection model.
+    """
+    threads = max(1, threads)
+    os.environ['OMP_THREAD_LIMIT'] = str(max(1, omp_thread_limit or threads))
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def pin_to_cores(child_index: int, cores_per_job: int) -> List[int]:
+    """
+    Pin this process to its own block of cores_per_job cores.
+    
+    Child i gets the i-th block of the available cores, wrapping around when
+    there are more children than blocks.
+    
+    Returns:
+        The cores the process is pinned to (empty if pinning is unsupported)
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        return []
+    
+    cores = available_cores()
+    blocks = max(1, len(cores) // cores_per_job)
+    start = (child_index % blocks) * cores_per_job
+    pinned = cores[start:start + cores_per_job]
+    os.sched_setaffinity(0, pinned)
+    return pinned
+
+
+def describe_topology(topology: Dict, affinity: bool) -> str:
+    """One-line summary for the worker log."""
+    return (
+        f"{topology['total_cores']} cores, {topology['concurrency']} jobs x "
+        f"{topology['cores_per_job']} cores, torch threads {topology['torch_threads']}, "
+        f"{topology['ocr_threads']} OCR threads, OMP_THREAD_LIMIT {topology['omp_thread_limit']}, "
+        f"CPU affinity {'on' if affinity else 'off'}"
+    )
@@ -50,6 +50,27 @@ class DetectedObject(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class ObjectTrack(Base):
+    """Object track database model: one object followed across frames."""
+    __tablename__ = "object_tracks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    video_id = Column(String, index=True, nullable=False)
+    track_id = Column(Integer, nullable=False)  # unique within the video
+    object_class = Column(String, nullable=False)
+    first_frame = Column(Integer, nullable=False)
+    last_frame = Column(Integer, nullable=False)
+    first_timestamp = Column(Float)  # in seconds
+    last_timestamp = Column(Float)
+    detection_count = Column(Integer)  # frames the object was detected in
+    peak_confidence = Column(Float, nullable=False)
+    bbox_x1 = Column(Float)  # Bounding box at peak confidence
+    bbox_y1 = Column(Float)
+    bbox_x2 = Column(Float)
+    bbox_y2 = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class ExtractedText(Base):
     """Extracted text database model."""
     __tablename__ = "extracted_texts"
@@ -91,6 +112,19 @@ class DetectedObjectResponse(BaseModel):
     bbox: BoundingBox
 
 
+class ObjectTrackResponse(BaseModel):
+    """Object track response model."""
+    track_id: int
+    object_class: str
+    first_frame: int
+    last_frame: int
+    first_timestamp: float
+    last_timestamp: float
+    detection_count: int
+    peak_confidence: float
+    bbox: BoundingBox
+
+
 class ExtractedTextResponse(BaseModel):
     """Extracted text response model."""
     frame_number: int
@@ -108,6 +142,7 @@ class VideoProcessingResult(BaseModel):
     fps: Optional[float] = None
     total_frames: int
     detected_objects: List[DetectedObjectResponse]
+    object_tracks: List[ObjectTrackResponse] = []
     extracted_texts: List[ExtractedTextResponse]
     error_message: Optional[str] = None
     created_at: datetime
@@ -121,3 +156,8 @@ class VideoStatusResponse(BaseModel):
     progress: Optional[float] = None  # 0-100
     message: str
     error_message: Optional[str] = None
+    stage: Optional[str] = None  # step of a running job, e.g. analyzing
+    frames_done: Optional[int] = None
+    frames_total: Optional[int] = None  # 0 if unknown (keyframe sampling)
+    fps: Optional[float] = None  # frames processed per second
+    eta_seconds: Optional[float] = None
@@ -0,0 +1,335 @@
+import cv2
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+from app.services.detections import Detections, match_boxes
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Detection runtimes and the ultralytics export format each one loads
+DETECTION_BACKENDS = {
+    'pytorch': None,
+    'onnx': 'onnx',
+    'openvino': 'openvino',
+    'torchscript': 'torchscript',
+}
+
+# Backends exported with dynamic batch and image axes; the others run one
+# frame per call at the size they were exported with
+DYNAMIC_SHAPE_BACKENDS = {'pytorch', 'onnx', 'openvino'}
+
+# INT8 quantization of the ONNX export, run with onnxruntime
+QUANTIZATION_MODES = ('none', 'dynamic', 'static')
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+# Inference image size: ultralytics' default, and the bounds of 'auto' mode,
+# which keeps the smallest objects of interest at least MIN_DETECTABLE_PIXELS
+# wide at network resolution
+DEFAULT_IMGSZ = 640
+AUTO_IMGSZ_RANGE = (320, 1280)
+MIN_DETECTABLE_PIXELS = 12
+IMGSZ_STRIDE = 32
+
+
+def exported_model_path(weights: str, backend: str) -> Path:
+    """
+    Location of an exported model, next to the PyTorch weights.
+    
+    Follows the ultralytics export naming, so exports made by hand are reused.
+    """
+    weights_path = Path(weights)
+    if backend == 'pytorch':
+        return weights_path
+    if backend == 'onnx':
+        return weights_path.with_suffix('.onnx')
+    if backend == 'openvino':
+        return weights_path.with_name(f"{weights_path.stem}_openvino_model")
+    if backend == 'torchscript':
+        return weights_path.with_suffix('.torchscript')
+    raise ValueError(f"Unknown detection backend: {backend}")
+
+
+def export_model(weights: str, backend: str, imgsz: int = 640) -> Path:
+    """
+    Export PyTorch weights for a detection backend.
+    
+    Args:
+        weights: Path to the .pt weights
+        backend: One of DETECTION_BACKENDS
+        imgsz: Input size the model is exported for
+    
+    Returns:
+        Path to the exported model
+    """
+    from ultralytics import YOLO
+    
+    export_format = DETECTION_BACKENDS[backend]
+    logger.info(f"Exporting {weights} for {backend}")
+    exported = YOLO(weights).export(
+        format=export_format,
+        imgsz=imgsz,
+        dynamic=backend in DYNAMIC_SHAPE_BACKENDS
+    )
+    return Path(exported)
+
+
+def resolve_imgsz(
+    imgsz: Union[int, str, None],
+    width: int = 0,
+    height: int = 0,
+    min_object_size: int = 32
+) -> int:
+    """
+    Inference image size for a video, rounded up to the model stride.
+
+    Args:
+        imgsz: Pixels on the longest side, 'auto', or None for the default
+        width: Video width, used by 'auto'
+        height: Video height, used by 'auto'
+        min_object_size: Smallest object of interest in source pixels, used by 'auto'
+
+    Returns:
+        Image size in pixels
+    """
+    if imgsz in (None, ''):
+        imgsz = DEFAULT_IMGSZ
+    elif str(imgsz).lower() == 'auto':
+        long_side = max(width, height)
+        if not long_side:
+            imgsz = DEFAULT_IMGSZ
+        else:
+            # Downscale as far as the smallest objects allow, but never upscale
+            low, high = AUTO_IMGSZ_RANGE
+            needed = long_side * MIN_DETECTABLE_PIXELS / max(1, min_object_size)
+            imgsz = min(max(needed, low), high, long_side)
+
+    return max(IMGSZ_STRIDE, math.ceil(int(imgsz) / IMGSZ_STRIDE) * IMGSZ_STRIDE)
+
+
+def quantized_model_path(weights: str, mode: str) -> Path:
+    """Location of an INT8 model, next to the PyTorch weights."""
+    weights_path = Path(weights)
+    return weights_path.with_name(f"{weights_path.stem}_int8_{mode}.onnx")
+
+
+def letterbox(image: np.ndarray, imgsz: int = 640) -> np.ndarray:
+    """
+    Resize a BGR image into an imgsz square network input, as ultralytics does.
+    
+    Returns:
+        Float32 RGB tensor of shape (1, 3, imgsz, imgsz) scaled to 0-1
+    """
+    height, width = image.shape[:2]
+    ratio = imgsz / max(height, width)
+    new_width, new_height = round(width * ratio), round(height * ratio)
+    resized = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - new_height) // 2, (imgsz - new_width) // 2
+    canvas[top:top + new_height, left:left + new_width] = resized
+    
+    tensor = canvas[:, :, ::-1].transpose(2, 0, 1)[None]
+    return np.ascontiguousarray(tensor, dtype=np.float32) / 255.0
+
+
+def load_calibration_frames(path: str, count: int = 100) -> List[np.ndarray]:
+    """
+    Collect BGR frames for static quantization from a video or image directory.
+    
+    Video frames are spread evenly over the whole clip.
+    
+    Args:
+        path: Video file or directory of images
+        count: Maximum number of frames
+    
+    Returns:
+        List of BGR images
+    """
+    source = Path(path)
+    if source.is_dir():
+        images = sorted(p for p in source.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+        frames = [cv2.imread(str(p)) for p in images[:count]]
+        return [frame for frame in frames if frame is not None]
+    
+    cap = cv2.VideoCapture(str(source))
+    try:
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        frames = []
+        for index in np.linspace(0, max(total - 1, 0), num=min(count, max(total, 1)), dtype=int):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+            ret, frame = cap.read()
+            if ret:
+                frames.append(frame)
+        return frames
+    finally:
+        cap.release()
+
+
+def quantize_model(
+    weights: str,
+    mode: str,
+    calibration_frames: Optional[List[np.ndarray]] = None,
+    imgsz: int = 640
+) -> Path:
+    """
+    Build an INT8 ONNX model from the FP32 ONNX export.
+    
+    Dynamic quantization only converts weights and needs no data. Static
+    quantization also fixes activation ranges, calibrated on our own frames.
+    
+    Args:
+        weights: Path to the .pt weights
+        mode: 'dynamic' or 'static'
+        calibration_frames: BGR frames, required for static quantization
+        imgsz: Network input size used for calibration
+    
+    Returns:
+        Path to the quantized model
+    """
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_dynamic, quantize_static
+    )
+    
+    fp32_path = exported_model_path(weights, 'onnx')
+    if not fp32_path.exists():
+        fp32_path = export_model(weights, 'onnx', imgsz)
+    output_path = quantized_model_path(weights, mode)
+    
+    logger.info(f"Quantizing {fp32_path} to INT8 ({mode})")
+    if mode == 'dynamic':
+        quantize_dynamic(str(fp32_path), str(output_path), weight_type=QuantType.QUInt8)
+    elif mode == 'static':
+        if not calibration_frames:
+            raise ValueError("Static quantization needs calibration frames")
+        
+        input_name = onnx.load(str(fp32_path)).graph.input[0].name
+        
+        class FrameCalibrationReader(CalibrationDataReader):
+            def __init__(self):
+                self.frames = iter(calibration_frames)
+            
+            def get_next(self):
+                frame = next(self.frames, None)
+                return None if frame is None else {input_name: letterbox(frame, imgsz)}
+        
+        quantize_static(
+            str(fp32_path),
+            str(output_path),
+            FrameCalibrationReader(),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True
+        )
+    else:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+    
+    # ultralytics reads class names, stride and imgsz from the model metadata
+    fp32_model = onnx.load(str(fp32_path))
+    int8_model = onnx.load(str(output_path))
+    onnx.helper.set_model_props(int8_model, {prop.key: prop.value for prop in fp32_model.metadata_props})
+    onnx.save(int8_model, str(output_path))
+    
+    return output_path
+
+
+def load_detection_model(
+    weights: str = 'yolov8n.pt',
+    backend: str = 'pytorch',
+    quantization: str = 'none',
+    calibration_path: str = '',
+    calibration_frames: int = 100
+):
+    """
+    Load a YOLO model for a detection backend, exporting it on first use.
+    
+    Exports are cached next to the weights and reused by later loads. All
+    backends are driven through the ultralytics YOLO interface, so callers
+    get the same Results objects whatever runtime executes the model.
+    Quantized models are ONNX and always run on onnxruntime.
+    
+    Args:
+        weights: Path to the .pt weights
+        backend: One of DETECTION_BACKENDS
+        quantization: One of QUANTIZATION_MODES
+        calibration_path: Video or image directory for static quantization
+        calibration_frames: Number of calibration frames to use
+    
+    Returns:
+        ultralytics YOLO model
+    """
+    from ultralytics import YOLO
+    
+    if backend not in DETECTION_BACKENDS:
+        raise ValueError(f"Unknown detection backend: {backend}")
+    
+    if quantization != 'none':
+        if backend not in ('pytorch', 'onnx'):
+            raise ValueError(f"INT8 quantization runs on onnxruntime, not {backend}")
+        
+        model_path = quantized_model_path(weights, quantization)
+        if not model_path.exists():
+            frames = None
+            if quantization == 'static':
+                if not calibration_path:
+                    raise ValueError("Static quantization needs a calibration video or image directory")
+                frames = load_calibration_frames(calibration_path, calibration_frames)
+            model_path = quantize_model(weights, quantization, frames)
+        
+        return YOLO(str(model_path), task='detect')
+    
+    if backend == 'pytorch':
+        return YOLO(weights)
+    
+    model_path = exported_model_path(weights, backend)
+    if not model_path.exists():
+        model_path = export_model(weights, backend)
+    
+    return YOLO(str(model_path), task='detect')
+
+
+def compare_detections(
+    reference: List[Detections],
+    candidate: List[Detections],
+    iou_threshold: float = 0.5
+) -> Dict:
+    """
+    Check a backend's output for parity with reference detections.
+    
+    Boxes are matched greedily per frame by class and IoU.
+    
+    Args:
+        reference: Per-frame detections of the reference (PyTorch) model
+        candidate: Per-frame detections of the backend under test
+        iou_threshold: Minimum IoU for two boxes to match
+    
+    Returns:
+        Dictionary with recall/precision against the reference, mean IoU and
+        mean absolute confidence difference of matched boxes
+    """
+    matched = 0
+    ious = []
+    confidence_deltas = []
+    reference_total = sum(len(frame) for frame in reference)
+    candidate_total = sum(len(frame) for frame in candidate)
+    
+    for ref, cand in zip(reference, candidate):
+        pairs = match_boxes(ref.boxes, ref.class_ids, cand.boxes, cand.class_ids, iou_threshold)
+        for i, j, iou in pairs:
+            matched += 1
+            ious.append(iou)
+            confidence_deltas.append(abs(float(ref.confidences[i] - cand.confidences[j])))
+    
+    return {
+        'reference_boxes': reference_total,
+        'candidate_boxes': candidate_total,
+        'matched_boxes': matched,
+        'recall': matched / reference_total if reference_total else 1.0,
+        'precision': matched / candidate_total if candidate_total else 1.0,
+        'mean_iou': float(np.mean(ious)) if ious else 0.0,
+        'mean_confidence_delta': float(np.mean(confidence_deltas)) if confidence_deltas else 0.0
+    }
@@ -0,0 +1,206 @@
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class Detections:
+    """
+    Object detections of one or many frames, stored as parallel arrays.
+    
+    Row i describes one box: boxes[i] is (x1, y1, x2, y2) in source pixels,
+    class_ids[i] indexes names, and frame_numbers/timestamps locate the frame.
+    Records (dicts) are only built at the API and database boundaries.
+    """
+    
+    __slots__ = ('boxes', 'class_ids', 'confidences', 'frame_numbers', 'timestamps', 'names')
+    
+    def __init__(
+        self,
+        boxes: np.ndarray,
+        class_ids: np.ndarray,
+        confidences: np.ndarray,
+        frame_numbers: Optional[np.ndarray] = None,
+        timestamps: Optional[np.ndarray] = None,
+        names: Optional[Dict[int, str]] = None
+    ):
+        count = len(class_ids)
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(count, 4)
+        self.class_ids = np.asarray(class_ids, dtype=np.int32)
+        self.confidences = np.asarray(confidences, dtype=np.float32)
+        self.frame_numbers = (
+            np.asarray(frame_numbers, dtype=np.int64)
+            if frame_numbers is not None else np.full(count, -1, dtype=np.int64)
+        )
+        self.timestamps = (
+            np.asarray(timestamps, dtype=np.float64)
+            if timestamps is not None else np.zeros(count, dtype=np.float64)
+        )
+        self.names = dict(names or {})
+    
+    def __len__(self) -> int:
+        return len(self.class_ids)
+    
+    @classmethod
+    def empty(cls, names: Optional[Dict[int, str]] = None) -> 'Detections':
+        """Detections with no boxes."""
+        return cls(np.empty((0, 4)), np.empty(0), np.empty(0), names=names)
+    
+    @classmethod
+    def from_result(cls, result, scale: float = 1.0) -> 'Detections':
+        """
+        Convert one ultralytics result in a single device-to-host copy.
+        
+        Args:
+            result: ultralytics Results object for one image
+            scale: Factor mapping result coordinates back to source pixels
+        """
+        # data columns: x1, y1, x2, y2, [track_id,] confidence, class
+        data = result.boxes.data.cpu().numpy()
+        boxes = data[:, :4]
+        if scale != 1.0:
+            boxes = boxes * scale
+        return cls(boxes, data[:, -1], data[:, -2], names=result.names)
+    
+    @classmethod
+    def concatenate(cls, parts: Iterable['Detections']) -> 'Detections':
+        """Stack detections of several frames, keeping their order."""
+        parts = list(parts)
+        names = {}
+        for part in parts:
+            names.update(part.names)
+        
+        if not parts:
+            return cls.empty()
+        
+        return cls(
+            np.concatenate([part.boxes for part in parts]),
+            np.concatenate([part.class_ids for part in parts]),
+            np.concatenate([part.confidences for part in parts]),
+            np.concatenate([part.frame_numbers for part in parts]),
+            np.concatenate([part.timestamps for part in parts]),
+            names
+        )
+    
+    def with_frame(self, frame_number: int, timestamp: float) -> 'Detections':
+        """The same boxes, stamped with a frame number and timestamp."""
+        count = len(self)
+        return Detections(
+            self.boxes,
+            self.class_ids,
+            self.confidences,
+            np.full(count, frame_number, dtype=np.int64),
+            np.full(count, timestamp, dtype=np.float64),
+            self.names
+        )
+    
+    def class_names(self) -> List[str]:
+        """Class name of every box."""
+        return [self.names.get(class_id, str(class_id)) for class_id in self.class_ids.tolist()]
+    
+    def to_dicts(self, with_frames: bool = True) -> List[Dict]:
+        """Per-box records in the detect_objects format, optionally with frame number and timestamp."""
+        records = []
+        for class_name, confidence, (x1, y1, x2, y2), frame_number, timestamp in zip(
+            self.class_names(),
+            self.confidences.tolist(),
+            self.boxes.tolist(),
+            self.frame_numbers.tolist(),
+            self.timestamps.tolist()
+        ):
+            record = {
+                'class': class_name,
+                'confidence': confidence,
+                'bbox': {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2}
+            }
+            if with_frames:
+                record['frame_number'] = frame_number
+                record['timestamp'] = timestamp
+            records.append(record)
+        return records
+    
+    def to_dict(self) -> Dict:
+        """Plain lists for JSON transport, e.g. between Celery tasks."""
+        return {
+            'boxes': self.boxes.tolist(),
+            'class_ids': self.class_ids.tolist(),
+            'confidences': self.confidences.tolist(),
+            'frame_numbers': self.frame_numbers.tolist(),
+            'timestamps': self.timestamps.tolist(),
+            'names': self.names
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Detections':
+        """Inverse of to_dict."""
+        return cls(
+            np.asarray(data['boxes'], dtype=np.float32),
+            data['class_ids'],
+            data['confidences'],
+            data['frame_numbers'],
+            data['timestamps'],
+            # JSON turns the integer class ids of names into strings
+            {int(class_id): name for class_id, name in data['names'].items()}
+        )
+    
+    def to_records(self, video_id: str) -> List[Dict]:
+        """Rows for a bulk insert into the detected_objects table."""
+        return [
+            {
+                'video_id': video_id,
+                'frame_number': frame_number,
+                'timestamp': timestamp,
+                'object_class': class_name,
+                'confidence': confidence,
+                'bbox_x1': x1,
+                'bbox_y1': y1,
+                'bbox_x2': x2,
+                'bbox_y2': y2
+            }
+            for class_name, confidence, (x1, y1, x2, y2), frame_number, timestamp in zip(
+                self.class_names(),
+                self.confidences.tolist(),
+                self.boxes.tolist(),
+                self.frame_numbers.tolist(),
+                self.timestamps.tolist()
+            )
+        ]
+
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between two sets of (x1, y1, x2, y2) boxes."""
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+    area_a = (boxes_a[:, 2:] - boxes_a[:, :2]).prod(axis=1)
+    area_b = (boxes_b[:, 2:] - boxes_b[:, :2]).prod(axis=1)
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return intersection / np.maximum(union, 1e-9)
+
+
+def match_boxes(
+    boxes_a: np.ndarray,
+    class_ids_a: np.ndarray,
+    boxes_b: np.ndarray,
+    class_ids_b: np.ndarray,
+    iou_threshold: float = 0.5
+) -> List[Tuple[int, int, float]]:
+    """
+    Greedily pair boxes of the same class, highest IoU first.
+    
+    Returns:
+        (index in a, index in b, IoU) for every pair with IoU >= iou_threshold
+    """
+    if not len(boxes_a) or not len(boxes_b):
+        return []
+    
+    iou = box_iou(boxes_a, boxes_b)
+    iou[class_ids_a[:, None] != class_ids_b[None, :]] = 0
+    
+    pairs = []
+    while True:
+        i, j = np.unravel_index(np.argmax(iou), iou.shape)
+        if iou[i, j] < iou_threshold or iou[i, j] <= 0:
+            break
+        pairs.append((int(i), int(j), float(iou[i, j])))
+        iou[i, :] = 0
+        iou[:, j] = 0
+    return pairs
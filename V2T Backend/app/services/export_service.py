@@ -3,9 +3,11 @@ Service for exporting video processing results to various formats
 """
 
 import os
+import csv
+import json
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -18,7 +20,8 @@ class ExportService:
     """Service for exporting video results to different formats."""
     
     @staticmethod
-    def export_to_text(video_id: int, video_filename: str, detected_objects: List, extracted_texts: List, status: str) -> str:
+    def export_to_text(video_id: int, video_filename: str, detected_objects: List, extracted_texts: List, status: str,
+                       object_tracks: Optional[List] = None) -> str:
         """
         Export video processing results to a text file.
         
@@ -28,6 +31,7 @@ class ExportService:
             detected_objects: List of detected objects
             extracted_texts: List of extracted texts
             status: Processing status
+            object_tracks: List of object tracks (optional)
             
         Returns:
             Path to the generated text file
@@ -69,6 +73,21 @@ class ExportService:
             else:
                 f.write("No objects detected.\n\n")
             
+            # Object Tracks Section
+            if object_tracks:
+                f.write("-" * 80 + "\n")
+                f.write(f"OBJECT TRACKS ({len(object_tracks)} total)\n")
+                f.write("-" * 80 + "\n\n")
+                
+                for idx, track in enumerate(object_tracks, 1):
+                    f.write(f"{idx}. Object: {track.object_class}\n")
+                    f.write(f"   Seen: {track.first_timestamp:.1f}s - {track.last_timestamp:.1f}s "
+                           f"(frames {track.first_frame}-{track.last_frame}, {track.detection_count} detections)\n")
+                    f.write(f"   Peak Confidence: {track.peak_confidence:.2%}\n")
+                    f.write(f"   Bounding Box: x1={track.bbox_x1}, y1={track.bbox_y1}, "
+                           f"x2={track.bbox_x2}, y2={track.bbox_y2}\n")
+                    f.write(f"\n")
+            
             # Extracted Texts Section
             f.write("-" * 80 + "\n")
             f.write(f"EXTRACTED TEXT\n")
@@ -112,6 +131,8 @@ class ExportService:
                 f.write(f"  - {label}: {count}\n")
             
             f.write(f"\nTotal Objects: {len(detected_objects)}\n")
+            if object_tracks:
+                f.write(f"Total Tracks: {len(object_tracks)}\n")
             f.write(f"Total Text Entries: {len(extracted_texts)}\n")
             
             f.write("\n" + "=" * 80 + "\n")
@@ -121,7 +142,8 @@ class ExportService:
         return str(output_path)
     
     @staticmethod
-    def export_to_pdf(video_id: int, video_filename: str, detected_objects: List, extracted_texts: List, status: str) -> str:
+    def export_to_pdf(video_id: int, video_filename: str, detected_objects: List, extracted_texts: List, status: str,
+                      object_tracks: Optional[List] = None) -> str:
         """
         Export video processing results to a PDF file.
         
@@ -131,6 +153,7 @@ class ExportService:
             detected_objects: List of detected objects
             extracted_texts: List of extracted texts
             status: Processing status
+            object_tracks: List of object tracks (optional)
             
         Returns:
             Path to the generated PDF file
@@ -240,6 +263,35 @@ class ExportService:
         
         story.append(Spacer(1, 0.3 * inch))
         
+        # Object Tracks Section
+        if object_tracks:
+            story.append(Paragraph(f"Object Tracks ({len(object_tracks)} total)", heading_style))
+            
+            track_data = [["#", "Object", "Peak Conf.", "Seen (s)", "Detections"]]
+            for idx, track in enumerate(object_tracks, 1):
+                track_data.append([
+                    str(idx),
+                    track.object_class,
+                    f"{track.peak_confidence:.1%}",
+                    f"{track.first_timestamp:.1f} - {track.last_timestamp:.1f}",
+                    str(track.detection_count)
+                ])
+            
+            track_table = Table(track_data, colWidths=[0.5*inch, 1.5*inch, 1*inch, 1.5*inch, 1*inch])
+            track_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('FONTSIZE', (0, 1), (-1, -1), 8),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+            ]))
+            story.append(track_table)
+            story.append(Spacer(1, 0.3 * inch))
+        
         # Extracted Texts Section
         story.append(Paragraph("Extracted Text", heading_style))
         
@@ -291,6 +343,8 @@ class ExportService:
             summary_text += "&nbsp;&nbsp;No objects detected<br/>"
         
         summary_text += f"<br/><b>Total Objects:</b> {len(detected_objects)}<br/>"
+        if object_tracks:
+            summary_text += f"<b>Total Tracks:</b> {len(object_tracks)}<br/>"
         summary_text += f"<b>Total Text Entries:</b> {len(extracted_texts)}"
         
         story.append(Paragraph(summary_text, styles['Normal']))
@@ -299,3 +353,159 @@ class ExportService:
         doc.build(story)
         
         return str(output_path)
+
+    @staticmethod
+    def export_to_json(video_id: int, video_filename: str, detected_objects: List, extracted_texts: List, status: str,
+                       duration: Optional[float] = None, fps: Optional[float] = None,
+                       object_tracks: Optional[List] = None) -> str:
+        """
+        Export video processing results to a JSON file.
+        
+        Args:
+            video_id: ID of the video
+            video_filename: Original filename
+            detected_objects: List of detected objects
+            extracted_texts: List of extracted texts
+            status: Processing status
+            duration: Video duration in seconds (optional)
+            fps: Video frame rate (optional)
+            object_tracks: List of object tracks (optional)
+        
+        Returns:
+            Path to the generated JSON file
+        """
+        # Create exports directory
+        export_dir = Path(settings.video_upload_dir).parent / "exports"
+        export_dir.mkdir(exist_ok=True)
+        
+        # Generate filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_filename = f"video_{video_id}_results_{timestamp}.json"
+        output_path = export_dir / output_filename
+        
+        object_tracks = object_tracks or []
+        
+        # Count objects by label
+        object_counts = {}
+        for obj in detected_objects:
+            object_counts[obj.object_class] = object_counts.get(obj.object_class, 0) + 1
+        
+        data = {
+            "video": {
+                "video_id": video_id,
+                "filename": video_filename,
+                "status": status,
+                "duration": duration,
+                "fps": fps,
+                "export_date": datetime.now().isoformat()
+            },
+            "detected_objects": [
+                {
+                    "frame_number": obj.frame_number,
+                    "timestamp": obj.timestamp,
+                    "object_class": obj.object_class,
+                    "confidence": obj.confidence,
+                    "bbox": {"x1": obj.bbox_x1, "y1": obj.bbox_y1, "x2": obj.bbox_x2, "y2": obj.bbox_y2}
+                }
+                for obj in detected_objects
+            ],
+            "object_tracks": [
+                {
+                    "track_id": track.track_id,
+                    "object_class": track.object_class,
+                    "first_frame": track.first_frame,
+                    "last_frame": track.last_frame,
+                    "first_timestamp": track.first_timestamp,
+                    "last_timestamp": track.last_timestamp,
+                    "detection_count": track.detection_count,
+                    "peak_confidence": track.peak_confidence,
+                    "bbox": {"x1": track.bbox_x1, "y1": track.bbox_y1, "x2": track.bbox_x2, "y2": track.bbox_y2}
+                }
+                for track in object_tracks
+            ],
+            "extracted_texts": [
+                {
+                    "frame_number": text.frame_number,
+                    "timestamp": text.timestamp,
+                    "text": text.text_content,
+                    "confidence": text.confidence
+                }
+                for text in extracted_texts
+            ],
+            "statistics": {
+                "total_objects": len(detected_objects),
+                "total_tracks": len(object_tracks),
+                "total_texts": len(extracted_texts),
+                "objects_by_class": object_counts
+            }
+        }
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        
+        return str(output_path)
+    
+    @staticmethod
+    def export_to_csv(video_id: int, video_filename: str, detected_objects: List, extracted_texts: List,
+                      object_tracks: Optional[List] = None) -> str:
+        """
+        Export video processing results to a CSV file.
+        
+        The file holds one section per result type (detected objects, object
+        tracks, extracted texts), each with its own header row and separated
+        by a blank line.
+        
+        Args:
+            video_id: ID of the video
+            video_filename: Original filename
+            detected_objects: List of detected objects
+            extracted_texts: List of extracted texts
+            object_tracks: List of object tracks (optional)
+        
+        Returns:
+            Path to the generated CSV file
+        """
+        # Create exports directory
+        export_dir = Path(settings.video_upload_dir).parent / "exports"
+        export_dir.mkdir(exist_ok=True)
+        
+        # Generate filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_filename = f"video_{video_id}_results_{timestamp}.csv"
+        output_path = export_dir / output_filename
+        
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Video ID", video_id])
+            writer.writerow(["Filename", video_filename])
+            writer.writerow([])
+            
+            # Detected Objects Section
+            writer.writerow(["DETECTED OBJECTS"])
+            writer.writerow(["frame_number", "timestamp", "object_class", "confidence",
+                             "bbox_x1", "bbox_y1", "bbox_x2", "bbox_y2"])
+            for obj in detected_objects:
+                writer.writerow([obj.frame_number, obj.timestamp, obj.object_class, obj.confidence,
+                                 obj.bbox_x1, obj.bbox_y1, obj.bbox_x2, obj.bbox_y2])
+            writer.writerow([])
+            
+            # Object Tracks Section
+            if object_tracks:
+                writer.writerow(["OBJECT TRACKS"])
+                writer.writerow(["track_id", "object_class", "first_frame", "last_frame", "first_timestamp",
+                                 "last_timestamp", "detection_count", "peak_confidence",
+                                 "bbox_x1", "bbox_y1", "bbox_x2", "bbox_y2"])
+                for track in object_tracks:
+                    writer.writerow([track.track_id, track.object_class, track.first_frame, track.last_frame,
+                                     track.first_timestamp, track.last_timestamp, track.detection_count,
+                                     track.peak_confidence, track.bbox_x1, track.bbox_y1,
+                                     track.bbox_x2, track.bbox_y2])
+                writer.writerow([])
+            
+            # Extracted Texts Section
+            writer.writerow(["EXTRACTED TEXTS"])
+            writer.writerow(["frame_number", "timestamp", "text", "confidence"])
+            for text in extracted_texts:
+                writer.writerow([text.frame_number, text.timestamp, text.text_content, text.confidence])
+        
+        return str(output_path)
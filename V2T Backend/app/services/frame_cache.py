@@ -0,0 +1,113 @@
+import cv2
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import List, Optional
+from app.services.frame_sources import VideoFrame
+
+
+def dhash(image: np.ndarray, hash_size: int = 16) -> np.ndarray:
+    """
+    Difference hash of a grayscale image.
+    
+    The image is shrunk to (hash_size + 1) x hash_size and each bit records
+    whether a pixel is brighter than its right neighbour.
+    
+    Returns:
+        Packed bits, hash_size * hash_size of them
+    """
+    small = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return np.packbits(small[:, 1:] > small[:, :-1])
+
+
+def hash_distance(hash_a: np.ndarray, hash_b: np.ndarray) -> float:
+    """Fraction of bits that differ between two hashes (0-1)."""
+    return float(np.unpackbits(np.bitwise_xor(hash_a, hash_b)).mean())
+
+
+class DetectionCache:
+    """
+    Temporal cache that lets near-identical frames reuse detections.
+    
+    Every frame is fingerprinted with a dHash of its thumbnail and compared
+    to the last frame that went through the model. Within the threshold, the
+    frame reuses that frame's detections; otherwise it is inferred and
+    becomes the new reference. max_age bounds how long one inference is
+    reused, so slow changes a hash cannot see are still picked up.
+    """
+    
+    def __init__(self, threshold: float = 0.02, max_age: float = 10.0, hash_size: int = 16):
+        """
+        Args:
+            threshold: Maximum fraction of differing hash bits to reuse detections
+            max_age: Re-run inference at least every N seconds (0 = never forced)
+            hash_size: Hash grid size; the hash has hash_size ** 2 bits
+        """
+        self.threshold = threshold
+        self.max_age = max_age
+        self.hash_size = hash_size
+        self._reference = None
+        self._reference_timestamp = None
+    
+    def needs_inference(self, frame: VideoFrame) -> bool:
+        """Return True if the frame must go through the model, and make it the new reference."""
+        fingerprint = dhash(frame.thumbnail, self.hash_size)
+        
+        if self._reference is not None:
+            fresh = not self.max_age or frame.timestamp - self._reference_timestamp < self.max_age
+            if fresh and hash_distance(fingerprint, self._reference) <= self.threshold:
+                return False
+        
+        self._reference = fingerprint
+        self._reference_timestamp = frame.timestamp
+        return True
+
+
+class OCRCache:
+    """
+    LRU cache of OCR results for text-region crops.
+    
+    Slides and captions stay on screen across many sampled frames, so the
+    same region is OCR'd over and over. Crops are keyed by their dHash plus
+    their approximate size; a crop with the same key reuses the cached words
+    instead of calling Tesseract. Safe to share between OCR threads.
+    """
+    
+    def __init__(self, max_entries: int = 256, hash_size: int = 16):
+        """
+        Args:
+            max_entries: Regions kept before the least recently used is evicted
+            hash_size: Hash grid size; the hash has hash_size ** 2 bits
+        """
+        self.max_entries = max(1, max_entries)
+        self.hash_size = hash_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def key(self, crop: np.ndarray) -> bytes:
+        """Cache key of a grayscale region crop."""
+        height, width = crop.shape[:2]
+        # Regions that look alike at hash resolution but differ in size hold different text
+        size = bytes((min(255, height // 8), min(255, width // 8)))
+        return dhash(crop, self.hash_size).tobytes() + size
+    
+    def get(self, key: bytes) -> Optional[List]:
+        """Cached words for a key, or None (counted as a miss)."""
+        with self._lock:
+            words = self._entries.get(key)
+            if words is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return words
+    
+    def put(self, key: bytes, words: List):
+        """Store the words recognized in a region, evicting the oldest entry if full."""
+        with self._lock:
+            self._entries[key] = words
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
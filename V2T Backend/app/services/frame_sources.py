@@ -0,0 +1,748 @@
+import os
+import cv2
+import ffmpeg
+from fractions import Fraction
+import statistics
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Frame sampling strategies for cv2.VideoCapture
+SAMPLING_STRATEGIES = ('auto', 'grab', 'seek')
+
+# Seek only when the gap to the next kept frame spans this many GOPs
+SEEK_GOP_FACTOR = 1.5
+
+# Width of the grayscale thumbnail used for cheap frame comparisons
+THUMBNAIL_WIDTH = 64
+
+# Frame difference metrics for adaptive sampling
+SCENE_CHANGE_METHODS = ('absdiff', 'histogram')
+
+# Available frame decoders
+FRAME_SOURCES = ('opencv', 'ffmpeg')
+
+# Frame sampling modes: fixed interval or encoder keyframes
+SAMPLING_MODES = ('fixed', 'keyframes')
+
+
+def probe_gop_size(video_path: str, fps: float, probe_seconds: int = 30) -> Optional[int]:
+    """
+    Estimate the keyframe interval (GOP size) of a video in frames.
+    
+    Only packet headers of the first seconds are read, nothing is decoded.
+    
+    Args:
+        video_path: Path to the video file
+        fps: Frame rate of the video stream
+        probe_seconds: How much of the video to inspect
+    
+    Returns:
+        Median distance between keyframes in frames, or None if unknown
+    """
+    try:
+        probe = ffmpeg.probe(
+            video_path,
+            select_streams='v:0',
+            show_entries='packet=pts_time,flags',
+            read_intervals=f'%+{probe_seconds}'
+        )
+        keyframe_times = [
+            float(packet['pts_time'])
+            for packet in probe.get('packets', [])
+            if 'K' in packet.get('flags', '') and packet.get('pts_time') not in (None, 'N/A')
+        ]
+        keyframe_times.sort()
+        
+        if len(keyframe_times) < 2:
+            return None
+        
+        gaps = [b - a for a, b in zip(keyframe_times, keyframe_times[1:]) if b > a]
+        if not gaps:
+            return None
+        
+        return max(1, int(round(statistics.median(gaps) * fps)))
+    
+    except Exception as e:
+        logger.warning(f"Failed to probe GOP size: {str(e)}")
+        return None
+
+
+def choose_seek_threshold(
+    strategy: str,
+    frame_interval: int,
+    gop_size: Optional[int] = None
+) -> Optional[int]:
+    """
+    Decide when the sampler should seek instead of grabbing through a gap.
+    
+    A seek jumps to the previous keyframe and decodes forward from there, so it
+    only pays off when the gap between kept frames is longer than a GOP.
+    
+    Args:
+        strategy: One of SAMPLING_STRATEGIES
+        frame_interval: Distance between kept frames in frames
+        gop_size: Keyframe interval in frames, if known
+    
+    Returns:
+        Minimum gap (in frames) that triggers a seek, or None to never seek
+    """
+    if strategy not in SAMPLING_STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy: {strategy}")
+    
+    if strategy == 'grab':
+        return None
+    if strategy == 'seek':
+        return 1
+    
+    # auto: seek across long gaps only when the keyframe spacing is known
+    if gop_size is None:
+        return None
+    threshold = max(2, int(gop_size * SEEK_GOP_FACTOR))
+    return threshold if frame_interval > threshold else None
+
+
+def iter_sampled_frames(
+    cap: cv2.VideoCapture,
+    frame_interval: int,
+    seek_threshold: Optional[int] = None,
+    start: int = 0,
+    stop: Optional[int] = None
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield every frame_interval-th frame of an opened capture.
+    
+    Skipped frames are only grabbed, never retrieved, so the color conversion
+    and copy are paid for kept frames only. Gaps of at least seek_threshold
+    frames are crossed with a keyframe seek instead of grabbing through them.
+    
+    Args:
+        cap: Opened cv2.VideoCapture positioned at frame 0
+        frame_interval: Keep one frame every N frames
+        seek_threshold: Minimum gap that triggers a seek (None: never seek)
+        start: First source frame index to yield (seeked to directly)
+        stop: Source frame index to stop before (None: end of video)
+    
+    Yields:
+        Tuples (source_frame_index, bgr_image)
+    """
+    frame_interval = max(1, frame_interval)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if stop is not None and (total_frames <= 0 or stop < total_frames):
+        total_frames = stop
+    
+    position = 0
+    target = start
+    if start > 0:
+        if not cap.set(cv2.CAP_PROP_POS_FRAMES, start):
+            return
+        position = start
+    
+    while total_frames <= 0 or target < total_frames:
+        gap = target - position
+        
+        if seek_threshold is not None and gap >= seek_threshold:
+            if not cap.set(cv2.CAP_PROP_POS_FRAMES, target):
+                break
+        else:
+            grabbed = True
+            for _ in range(gap):
+                if not cap.grab():
+                    grabbed = False
+                    break
+            if not grabbed:
+                break
+        
+        ret, frame = cap.read()
+        if not ret:
+            break
+        
+        yield target, frame
+        position = target + 1
+        target += frame_interval
+
+
+class VideoFrame:
+    """A sampled frame decoded once, with lazily derived views per pipeline stage."""
+    
+    __slots__ = (
+        'frame_number', 'timestamp', 'image', 'scale', 'path', 'shared', '_gray', '_thumbnail', '_detector'
+    )
+    
+    def __init__(
+        self,
+        frame_number: int,
+        timestamp: float,
+        image: np.ndarray,
+        scale: float = 1.0,
+        shared: bool = False
+    ):
+        self.frame_number = frame_number
+        self.timestamp = timestamp
+        self.image = image  # BGR, as expected by YOLO
+        self.scale = scale  # Source pixels per decoded pixel, for mapping boxes back
+        self.path = None  # Set when the frame is written to disk
+        self.shared = shared  # Image lives in a decoder buffer that will be reused
+        self._gray = None
+        self._thumbnail = None
+        self._detector = None
+    
+    def detach(self) -> 'VideoFrame':
+        """Copy the image out of a reusable decoder buffer so the frame can be held."""
+        if self.shared:
+            self.image = self.image.copy()
+            self.shared = False
+        return self
+    
+    def release(self) -> 'VideoFrame':
+        """Drop the pixels of a frame that is only passed on for its number and timestamp."""
+        self.image = None
+        self._gray = None
+        self._thumbnail = None
+        self._detector = None
+        self.shared = False
+        return self
+    
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale view for OCR, converted on first access."""
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        return self._gray
+    
+    @property
+    def thumbnail(self) -> np.ndarray:
+        """Small grayscale view for frame comparisons, THUMBNAIL_WIDTH pixels wide."""
+        if self._thumbnail is None:
+            height, width = self.gray.shape[:2]
+            thumb_height = max(1, round(height * THUMBNAIL_WIDTH / width))
+            self._thumbnail = cv2.resize(
+                self.gray, (THUMBNAIL_WIDTH, thumb_height), interpolation=cv2.INTER_AREA
+            )
+        return self._thumbnail
+    
+    def detector_view(self, max_size: Optional[int]) -> Tuple[np.ndarray, float]:
+        """
+        BGR view for the object detector, downscaled once to at most max_size
+        pixels on the longest side, while OCR keeps the full decoded image.
+        
+        Returns:
+            (image, source pixels per image pixel)
+        """
+        if not max_size:
+            return self.image, self.scale
+        if self._detector is None or self._detector[0] != max_size:
+            height, width = self.image.shape[:2]
+            out_width, out_height = scaled_size(width, height, max_size)
+            image = self.image
+            if (out_width, out_height) != (width, height):
+                image = cv2.resize(self.image, (out_width, out_height), interpolation=cv2.INTER_AREA)
+            self._detector = (max_size, image, self.scale * width / out_width)
+        return self._detector[1], self._detector[2]
+
+
+class SceneChangeDetector:
+    """
+    Adaptive sampler that picks the candidate frames worth running inference on.
+    
+    Each candidate is compared to the last processed frame on a downscaled
+    grayscale thumbnail. A frame is processed when the difference crosses the
+    threshold, or when max_gap seconds passed since the last processed frame.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.05,
+        max_gap: float = 30.0,
+        method: str = 'absdiff'
+    ):
+        """
+        Args:
+            threshold: Minimum difference score (0-1) that counts as a change
+            max_gap: Process at least one frame every N seconds
+            method: Difference metric, one of SCENE_CHANGE_METHODS
+        """
+        if method not in SCENE_CHANGE_METHODS:
+            raise ValueError(f"Unknown scene change method: {method}")
+        
+        self.threshold = threshold
+        self.max_gap = max_gap
+        self.method = method
+        self._reference = None
+        self._reference_timestamp = None
+    
+    def score(self, frame: VideoFrame) -> float:
+        """Difference between a frame and the last processed frame (0-1)."""
+        if self._reference is None:
+            return 1.0
+        
+        if self.method == 'histogram':
+            hist = self._histogram(frame.thumbnail)
+            return float(cv2.compareHist(self._reference, hist, cv2.HISTCMP_BHATTACHARYYA))
+        
+        thumbnail = frame.thumbnail
+        if thumbnail.shape != self._reference.shape:
+            return 1.0
+        return float(cv2.absdiff(thumbnail, self._reference).mean()) / 255.0
+    
+    def should_process(self, frame: VideoFrame) -> bool:
+        """Return True if the frame needs inference, and make it the new reference."""
+        due = (
+            self._reference_timestamp is None
+            or frame.timestamp - self._reference_timestamp >= self.max_gap
+        )
+        if not due and self.score(frame) < self.threshold:
+            return False
+        
+        if self.method == 'histogram':
+            self._reference = self._histogram(frame.thumbnail)
+        else:
+            self._reference = frame.thumbnail
+        self._reference_timestamp = frame.timestamp
+        return True
+    
+    @staticmethod
+    def _histogram(thumbnail: np.ndarray) -> np.ndarray:
+        hist = cv2.calcHist([thumbnail], [0], None, [64], [0, 256])
+        return cv2.normalize(hist, hist).flatten()
+
+
+def scaled_size(width: int, height: int, max_size: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Output size for decoding at most max_size pixels on the longest side.
+    
+    Frames are never upscaled, and dimensions are kept even for the encoders.
+    """
+    if not max_size or max(width, height) <= max_size:
+        return width, height
+    
+    ratio = max_size / max(width, height)
+    return (
+        max(2, int(round(width * ratio / 2)) * 2),
+        max(2, int(round(height * ratio / 2)) * 2)
+    )
+
+
+class OpenCVFrameSource:
+    """Frame source decoding a video with cv2.VideoCapture."""
+    
+    def __init__(
+        self,
+        video_path: str,
+        interval: int = 1,
+        strategy: str = 'auto',
+        max_size: Optional[int] = None,
+        start: int = 0,
+        stop: Optional[int] = None
+    ):
+        """
+        Args:
+            video_path: Path to the video file
+            interval: Sample one frame every N seconds
+            strategy: Sampling strategy, one of SAMPLING_STRATEGIES
+            max_size: Downscale frames to at most this many pixels on the longest side
+            start: First frame number to yield (for decoding a segment)
+            stop: Frame number to stop before (None: end of video)
+        """
+        self.video_path = video_path
+        self.interval = interval
+        self.strategy = strategy
+        self.max_size = max_size
+        self.start = start
+        self.stop = stop
+    
+    def __iter__(self) -> Iterator[VideoFrame]:
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            raise IOError(f"Cannot open video: {self.video_path}")
+        
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_interval = max(1, int(fps * self.interval))
+            
+            gop_size = None
+            if self.strategy == 'auto':
+                gop_size = probe_gop_size(self.video_path, fps)
+            seek_threshold = choose_seek_threshold(self.strategy, frame_interval, gop_size)
+            logger.info(
+                f"Sampling every {frame_interval} frames "
+                f"(strategy={self.strategy}, gop={gop_size}, seek_threshold={seek_threshold})"
+            )
+            
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            out_width, out_height = scaled_size(width, height, self.max_size)
+            scale = width / out_width
+            
+            # Frame numbers count sampled frames, so segments map to source frames
+            stop = self.stop * frame_interval if self.stop is not None else None
+            frames = iter_sampled_frames(
+                cap, frame_interval, seek_threshold, self.start * frame_interval, stop
+            )
+            
+            frame_number = self.start
+            for frame_index, image in frames:
+                if scale != 1.0:
+                    image = cv2.resize(image, (out_width, out_height), interpolation=cv2.INTER_AREA)
+                yield VideoFrame(frame_number, frame_index / fps, image, scale)
+                frame_number += 1
+        finally:
+            cap.release()
+
+
+class FFmpegFrameSource:
+    """
+    Frame source reading raw BGR frames from an ffmpeg subprocess.
+    
+    Decimation (select filter) and downscaling (scale filter) run inside ffmpeg's
+    multithreaded decoder, and frames are read straight into a small ring of
+    preallocated numpy buffers. A yielded frame's image stays valid until
+    buffer_count more frames have been read; detach() it to keep it longer.
+    """
+    
+    def __init__(
+        self,
+        video_path: str,
+        interval: int = 1,
+        max_size: Optional[int] = None,
+        buffer_count: int = 4,
+        start: int = 0,
+        stop: Optional[int] = None
+    ):
+        """
+        Args:
+            video_path: Path to the video file
+            interval: Sample one frame every N seconds
+            max_size: Downscale frames to at most this many pixels on the longest side
+            buffer_count: Number of preallocated frame buffers
+            start: First frame number to yield (for decoding a segment)
+            stop: Frame number to stop before (None: end of video)
+        """
+        self.video_path = video_path
+        self.interval = interval
+        self.max_size = max_size
+        self.buffer_count = max(1, buffer_count)
+        self.start = start
+        self.stop = stop
+    
+    def __iter__(self) -> Iterator[VideoFrame]:
+        probe = ffmpeg.probe(self.video_path, select_streams='v:0')
+        stream = probe['streams'][0]
+        width = int(stream['width'])
+        height = int(stream['height'])
+        
+        # Keep the same frame grid as the OpenCV source: every N-th source frame
+        fps = Fraction(stream['r_frame_rate'])
+        frame_interval = max(1, int(float(fps) * self.interval))
+        
+        out_width, out_height = scaled_size(width, height, self.max_size)
+        scale = width / out_width
+        
+        # Segments start half a frame before their first frame, so the accurate
+        # seek drops everything before it and frame counting restarts there
+        input_args = {}
+        if self.start > 0:
+            input_args['ss'] = float((self.start * frame_interval - Fraction(1, 2)) / fps)
+        # Pass selected frames through as they are, without duplicating or dropping
+        # any to fill a constant output rate
+        output_args = {'fps_mode': 'passthrough'}
+        if self.stop is not None:
+            output_args['vframes'] = max(0, self.stop - self.start)
+        
+        # Select source frames by index rather than resampling by time, which
+        # picks frames off the grid and drops the last sample
+        stream_input = ffmpeg.input(self.video_path, **input_args).filter(
+            'select', f'not(mod(n,{frame_interval}))'
+        )
+        if scale != 1.0:
+            stream_input = stream_input.filter('scale', out_width, out_height, flags='area')
+        
+        process = (
+            stream_input
+            .output('pipe:', format='rawvideo', pix_fmt='bgr24', **output_args)
+            .global_args('-nostdin', '-loglevel', 'error')
+            .run_async(pipe_stdout=True, pipe_stderr=True)
+        )
+        logger.info(
+            f"Decoding every {frame_interval} frames with ffmpeg, "
+            f"{out_width}x{out_height} (source {width}x{height})"
+        )
+        
+        images = iter_rawvideo(process, out_width, out_height, self.buffer_count)
+        for frame_number, image in enumerate(images, self.start):
+            timestamp = frame_number * frame_interval / float(fps)
+            yield VideoFrame(frame_number, timestamp, image, scale, shared=True)
+
+
+def probe_keyframe_times(video_path: str) -> List[float]:
+    """
+    List the presentation timestamps of all keyframes, relative to the stream start.
+    
+    Only packet headers are read, nothing is decoded.
+    """
+    probe = ffmpeg.probe(
+        video_path,
+        select_streams='v:0',
+        show_entries='packet=pts_time,flags:stream=start_time'
+    )
+    
+    start_time = 0.0
+    streams = probe.get('streams', [])
+    if streams and streams[0].get('start_time') not in (None, 'N/A'):
+        start_time = float(streams[0]['start_time'])
+    
+    keyframe_times = [
+        float(packet['pts_time']) - start_time
+        for packet in probe.get('packets', [])
+        if 'K' in packet.get('flags', '') and packet.get('pts_time') not in (None, 'N/A')
+    ]
+    return sorted(keyframe_times)
+
+
+class KeyframeFrameSource:
+    """
+    Frame source decoding only the encoder's keyframes (I-frames).
+    
+    ffmpeg skips every non-key frame in the decoder (-skip_frame nokey), which
+    is many times faster than a full decode. Timestamps are the keyframes' real
+    presentation times, so the sampling grid follows the encoder's GOPs.
+    """
+    
+    def __init__(
+        self,
+        video_path: str,
+        min_spacing: float = 0.0,
+        max_size: Optional[int] = None,
+        buffer_count: int = 4
+    ):
+        """
+        Args:
+            video_path: Path to the video file
+            min_spacing: Drop keyframes closer than N seconds to the last kept one
+            max_size: Downscale frames to at most this many pixels on the longest side
+            buffer_count: Number of preallocated frame buffers
+        """
+        self.video_path = video_path
+        self.min_spacing = min_spacing
+        self.max_size = max_size
+        self.buffer_count = max(1, buffer_count)
+    
+    def __iter__(self) -> Iterator[VideoFrame]:
+        probe = ffmpeg.probe(self.video_path, select_streams='v:0')
+        stream = probe['streams'][0]
+        width = int(stream['width'])
+        height = int(stream['height'])
+        keyframe_times = probe_keyframe_times(self.video_path)
+        
+        out_width, out_height = scaled_size(width, height, self.max_size)
+        scale = width / out_width
+        
+        stream_input = ffmpeg.input(self.video_path, skip_frame='nokey')
+        if scale != 1.0:
+            stream_input = stream_input.filter('scale', out_width, out_height, flags='area')
+        
+        process = (
+            stream_input
+            .output('pipe:', format='rawvideo', pix_fmt='bgr24', fps_mode='passthrough')
+            .global_args('-nostdin', '-loglevel', 'error')
+            .run_async(pipe_stdout=True, pipe_stderr=True)
+        )
+        logger.info(
+            f"Decoding {len(keyframe_times)} keyframes with ffmpeg, "
+            f"{out_width}x{out_height} (source {width}x{height})"
+        )
+        
+        images = iter_rawvideo(process, out_width, out_height, self.buffer_count)
+        frame_number = 0
+        last_timestamp = None
+        decoded = 0
+        
+        try:
+            for image in images:
+                if decoded == len(keyframe_times):
+                    # Frames without a probed timestamp can't be placed on the timeline
+                    logger.warning(
+                        f"ffmpeg decoded more than the {len(keyframe_times)} probed keyframes; "
+                        f"dropping the rest"
+                    )
+                    break
+                timestamp = keyframe_times[decoded]
+                decoded += 1
+                if last_timestamp is not None and timestamp - last_timestamp < self.min_spacing:
+                    continue
+                yield VideoFrame(frame_number, timestamp, image, scale, shared=True)
+                frame_number += 1
+                last_timestamp = timestamp
+            else:
+                if decoded < len(keyframe_times):
+                    logger.warning(
+                        f"Decoded {decoded} keyframes but probed {len(keyframe_times)}"
+                    )
+        finally:
+            # Stop ffmpeg as soon as the source stops, not when the generator is collected
+            images.close()
+
+
+def iter_rawvideo(
+    process,
+    width: int,
+    height: int,
+    buffer_count: int = 4
+) -> Iterator[np.ndarray]:
+    """
+    Read bgr24 frames from an ffmpeg process into a ring of preallocated buffers.
+    
+    Args:
+        process: ffmpeg subprocess writing rawvideo to stdout
+        width: Frame width in pixels
+        height: Frame height in pixels
+        buffer_count: Number of buffers; a yielded array is reused after that many frames
+    
+    Yields:
+        BGR frames as numpy arrays
+    """
+    frame_size = width * height * 3
+    buffers = [
+        np.empty((height, width, 3), dtype=np.uint8)
+        for _ in range(buffer_count)
+    ]
+    
+    try:
+        count = 0
+        while True:
+            buffer = buffers[count % buffer_count]
+            if not _read_into(process.stdout, buffer, frame_size):
+                break
+            yield buffer
+            count += 1
+        
+        process.wait()
+        if process.returncode != 0:
+            error = process.stderr.read().decode(errors='replace').strip()
+            raise IOError(f"ffmpeg exited with code {process.returncode}: {error}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def _read_into(pipe, buffer: np.ndarray, size: int) -> bool:
+    """Fill buffer from the pipe; return False at end of stream."""
+    view = memoryview(buffer).cast('B')
+    filled = 0
+    while filled < size:
+        count = pipe.readinto(view[filled:])
+        if not count:
+            return False
+        filled += count
+    return True
+
+
+def create_frame_source(
+    video_path: str,
+    interval: int = 1,
+    source: str = 'opencv',
+    strategy: str = 'auto',
+    max_size: Optional[int] = None,
+    sampling_mode: str = 'fixed',
+    keyframe_min_spacing: float = 0.0,
+    start: int = 0,
+    stop: Optional[int] = None
+) -> Iterable[VideoFrame]:
+    """
+    Build a frame source by name.
+    
+    Args:
+        video_path: Path to the video file
+        interval: Sample one frame every N seconds
+        source: Decoder, one of FRAME_SOURCES
+        strategy: Sampling strategy for the OpenCV decoder
+        max_size: Downscale frames to at most this many pixels on the longest side
+        sampling_mode: One of SAMPLING_MODES; 'keyframes' ignores interval and source
+        keyframe_min_spacing: Minimum seconds between keyframes in 'keyframes' mode
+        start: First frame number to yield, in 'fixed' mode
+        stop: Frame number to stop before, in 'fixed' mode
+    
+    Returns:
+        Iterable of VideoFrame objects
+    """
+    if sampling_mode == 'keyframes':
+        if start or stop is not None:
+            raise ValueError("Keyframe sampling does not support segments")
+        return KeyframeFrameSource(video_path, keyframe_min_spacing, max_size)
+    if sampling_mode != 'fixed':
+        raise ValueError(f"Unknown sampling mode: {sampling_mode}")
+    
+    if source == 'opencv':
+        return OpenCVFrameSource(video_path, interval, strategy, max_size, start, stop)
+    if source == 'ffmpeg':
+        return FFmpegFrameSource(video_path, interval, max_size, start=start, stop=stop)
+    raise ValueError(f"Unknown frame source: {source}")
+
+
+def save_frames(frames: Iterable[VideoFrame], output_dir: str) -> Iterator[VideoFrame]:
+    """
+    Write frames to disk as JPEGs while passing them through.
+    
+    Args:
+        frames: Frames to save
+        output_dir: Directory for frame_XXXXXX.jpg files
+    
+    Yields:
+        The same frames, with their path set
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    for frame in frames:
+        frame.path = os.path.join(output_dir, f"frame_{frame.frame_number:06d}.jpg")
+        cv2.imwrite(frame.path, frame.image)
+        yield frame
+
+
+def count_sampled_frames(video_path: str, interval: int = 1) -> int:
+    """
+    Number of frames a fixed-interval source yields for a video.
+    
+    Based on the container's frame count, which may be approximate.
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+    
+    if fps <= 0 or total_frames <= 0:
+        return 0
+    frame_interval = max(1, int(fps * interval))
+    return (total_frames + frame_interval - 1) // frame_interval
+
+
+def plan_segments(
+    total_samples: int,
+    workers: int,
+    min_samples: int = 1
+) -> List[Tuple[int, Optional[int]]]:
+    """
+    Split sampled frame numbers into contiguous ranges for parallel decoding.
+    
+    Args:
+        total_samples: Expected number of sampled frames
+        workers: Maximum number of segments
+        min_samples: Minimum number of frames per segment
+    
+    Returns:
+        List of (start, stop) frame number ranges; the last one is open-ended
+        (stop None) so frames beyond an inaccurate frame count are not lost
+    """
+    count = max(1, min(workers, total_samples // max(1, min_samples)))
+    bounds = [total_samples * i // count for i in range(count)]
+    return [
+        (start, bounds[i + 1] if i + 1 < count else None)
+        for i, start in enumerate(bounds)
+    ]
@@ -0,0 +1,134 @@
+import queue
+import threading
+import numpy as np
+import pytesseract
+from contextlib import contextmanager
+from typing import Dict, Iterator
+import logging
+
+logger = logging.getLogger(__name__)
+
+OCR_ENGINES = ('auto', 'tesserocr', 'pytesseract')
+
+
+class TesseractPool:
+    """
+    Fixed-size pool of initialized Tesseract instances (tesserocr C API).
+    
+    Each instance loads its language model once and is reused for every
+    frame, with images passed as raw bytes instead of temp files. Callers
+    block while all instances are busy, so the pool also bounds OCR
+    parallelism. tesserocr releases the GIL while recognizing, so threads
+    sharing a pool run in parallel.
+    """
+    
+    def __init__(self, size: int = 1, language: str = 'eng'):
+        from tesserocr import PyTessBaseAPI
+        
+        self.language = language
+        self._apis = queue.Queue()
+        for _ in range(max(1, size)):
+            self._apis.put(PyTessBaseAPI(lang=language))
+    
+    @contextmanager
+    def acquire(self) -> Iterator:
+        """Borrow an engine for the duration of a with block."""
+        api = self._apis.get()
+        try:
+            yield api
+        finally:
+            api.Clear()
+            self._apis.put(api)
+    
+    def image_to_data(self, image: np.ndarray) -> Dict:
+        """
+        Recognize words in a grayscale or BGR array.
+        
+        Returns:
+            Word lists in pytesseract's image_to_data dict layout
+            (text, conf, left, top, width, height)
+        """
+        from tesserocr import RIL, iterate_level
+        
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        if channels == 3:
+            # Tesseract expects RGB byte order
+            image = np.ascontiguousarray(image[:, :, ::-1])
+        
+        data = {'text': [], 'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+        with self.acquire() as api:
+            api.SetImageBytes(image.tobytes(), width, height, channels, width * channels)
+            api.Recognize()
+            
+            iterator = api.GetIterator()
+            if iterator is None:
+                return data
+            
+            for word in iterate_level(iterator, RIL.WORD):
+                text = word.GetUTF8Text(RIL.WORD)
+                box = word.BoundingBox(RIL.WORD)
+                if text is None or box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                data['text'].append(text)
+                data['conf'].append(word.Confidence(RIL.WORD))
+                data['left'].append(x1)
+                data['top'].append(y1)
+                data['width'].append(x2 - x1)
+                data['height'].append(y2 - y1)
+        
+        return data
+
+
+_pools: Dict[str, TesseractPool] = {}
+_pools_lock = threading.Lock()
+_tesserocr_failed = False
+
+
+def get_tesseract_pool(language: str, size: int) -> TesseractPool:
+    """This process's engine pool for a language, created on first use."""
+    with _pools_lock:
+        if language not in _pools:
+            _pools[language] = TesseractPool(size, language)
+            logger.info(f"Started {size} Tesseract engines for '{language}'")
+        return _pools[language]
+
+
+def image_to_data(image: np.ndarray, language: str = 'eng', engine: str = 'auto', pool_size: int = 1) -> Dict:
+    """
+    Run Tesseract on an array, through the engine pool when available.
+    
+    'auto' uses tesserocr if it is installed and falls back to pytesseract,
+    which starts a tesseract process per call, if it isn't or fails to start.
+    
+    Args:
+        image: Grayscale or BGR array
+        language: OCR language
+        engine: One of OCR_ENGINES
+        pool_size: Tesseract instances per process (tesserocr only)
+    
+    Returns:
+        Word lists in pytesseract's image_to_data dict layout
+    """
+    global _tesserocr_failed
+    
+    if engine not in OCR_ENGINES:
+        raise ValueError(f"Unknown OCR engine: {engine}")
+    
+    if engine != 'pytesseract' and not _tesserocr_failed:
+        try:
+            pool = get_tesseract_pool(language, pool_size)
+        except Exception as e:
+            if engine == 'tesserocr':
+                raise
+            # Don't retry a missing binding on every frame
+            _tesserocr_failed = True
+            logger.warning(f"tesserocr unavailable, falling back to pytesseract: {str(e)}")
+        else:
+            return pool.image_to_data(image)
+    
+    if image.ndim == 3:
+        image = image[:, :, ::-1]
+    return pytesseract.image_to_data(image, lang=language, output_type=pytesseract.Output.DICT)
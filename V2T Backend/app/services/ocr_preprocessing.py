@@ -0,0 +1,153 @@
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Steps run in this order, whatever order they are configured in
+OCR_PREPROCESSING_STEPS = ('grayscale', 'normalize', 'denoise', 'deskew', 'binarize')
+
+# Scale limits for resolution normalization
+MIN_TEXT_SCALE = 0.5
+MAX_TEXT_SCALE = 4.0
+
+# Skews beyond this many degrees are layout (vertical text, rotated signs), not scanning error
+MAX_SKEW = 10.0
+
+
+def parse_preprocessing(spec: Optional[str]) -> List[str]:
+    """
+    Parse a comma-separated list of preprocessing steps.
+    
+    Returns:
+        The steps in pipeline order
+    
+    Raises:
+        ValueError: If a step is not in OCR_PREPROCESSING_STEPS
+    """
+    names = [name.strip().lower() for name in (spec or '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in OCR_PREPROCESSING_STEPS]
+    if unknown:
+        raise ValueError(f"Unknown OCR preprocessing steps: {', '.join(unknown)}")
+    return [step for step in OCR_PREPROCESSING_STEPS if step in names]
+
+
+def _text_mask(gray: np.ndarray) -> np.ndarray:
+    """Otsu foreground mask with text (the minority class) set to 255."""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    if cv2.countNonZero(binary) > binary.size / 2:
+        binary = cv2.bitwise_not(binary)
+    return binary
+
+
+def estimate_text_height(gray: np.ndarray) -> Optional[float]:
+    """Median glyph height in pixels, or None if no glyph-like components are found."""
+    count, _, stats, _ = cv2.connectedComponentsWithStats(_text_mask(gray), connectivity=8)
+    heights = stats[1:count, cv2.CC_STAT_HEIGHT]
+    areas = stats[1:count, cv2.CC_STAT_AREA]
+    # Drop specks and components spanning the whole crop (borders, backgrounds)
+    heights = heights[(areas >= 6) & (heights >= 3) & (heights < gray.shape[0] * 0.9)]
+    if not len(heights):
+        return None
+    return float(np.median(heights))
+
+
+def normalize_resolution(gray: np.ndarray, text_height: int = 30) -> Tuple[np.ndarray, float]:
+    """
+    Rescale so glyphs are about text_height pixels tall.
+    
+    Tesseract is most accurate with glyphs around 20-30 pixels; tiny text
+    is misread and oversized text wastes recognition time.
+    
+    Returns:
+        Rescaled image and the scale factor applied
+    """
+    height = estimate_text_height(gray)
+    if height is None:
+        return gray, 1.0
+    
+    factor = float(np.clip(text_height / height, MIN_TEXT_SCALE, MAX_TEXT_SCALE))
+    if abs(factor - 1.0) < 0.15:
+        return gray, 1.0
+    
+    interpolation = cv2.INTER_CUBIC if factor > 1 else cv2.INTER_AREA
+    resized = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=interpolation)
+    return resized, factor
+
+
+def denoise(gray: np.ndarray) -> np.ndarray:
+    """Remove compression noise and speckle while keeping stroke edges."""
+    return cv2.medianBlur(gray, 3)
+
+
+def deskew(gray: np.ndarray) -> np.ndarray:
+    """Rotate slightly skewed text back to horizontal."""
+    points = cv2.findNonZero(_text_mask(gray))
+    if points is None or len(points) < 50:
+        return gray
+    
+    # minAreaRect reports angles in (0, 90] on OpenCV >= 4.5 and [-90, 0) before
+    angle = cv2.minAreaRect(points)[-1]
+    if angle > 45:
+        angle -= 90
+    elif angle < -45:
+        angle += 90
+    if abs(angle) < 0.5 or abs(angle) > MAX_SKEW:
+        return gray
+    
+    height, width = gray.shape[:2]
+    rotation = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(
+        gray, rotation, (width, height), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE
+    )
+
+
+def binarize(gray: np.ndarray, text_height: int = 30) -> np.ndarray:
+    """
+    Adaptive threshold to dark text on a white background.
+    
+    Light text (subtitles, captions) is inverted first, since Tesseract
+    expects dark glyphs and a local threshold keeps only their edges otherwise.
+    """
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    if cv2.countNonZero(binary) < binary.size / 2:
+        gray = cv2.bitwise_not(gray)
+    
+    # The neighbourhood must span more than a stroke to find the local background
+    block_size = max(15, text_height | 1)
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block_size, 10
+    )
+
+
+def preprocess_for_ocr(
+    image: np.ndarray,
+    steps: List[str],
+    text_height: int = 30
+) -> Tuple[np.ndarray, float]:
+    """
+    Prepare an in-memory frame or crop for Tesseract.
+    
+    Args:
+        image: Grayscale or BGR array
+        steps: Steps from parse_preprocessing
+        text_height: Target glyph height in pixels for 'normalize'
+    
+    Returns:
+        Processed grayscale image and the scale factor applied to it; divide
+        word coordinates by it to map them back. Deskewing rotates by at most
+        MAX_SKEW degrees, so coordinates are not corrected for it.
+    """
+    factor = 1.0
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if 'normalize' in steps:
+        image, factor = normalize_resolution(image, text_height)
+    if 'denoise' in steps:
+        image = denoise(image)
+    if 'deskew' in steps:
+        image = deskew(image)
+    if 'binarize' in steps:
+        image = binarize(image, text_height)
+    return image, factor
@@ -0,0 +1,213 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Seconds between checks of the stop flag while blocked on a queue
+POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class _Failure:
+    """Exception raised in a stage, forwarded to the consumer."""
+    
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class StageStats:
+    """Work and queue counters of one pipeline stage."""
+    
+    def __init__(self, name: str, workers: int, queue_size: int):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float, depth: int):
+        """Count one item that took seconds of work and left depth items in the output queue."""
+        with self._lock:
+            self.items += 1
+            self.busy_seconds += seconds
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+            self._depth_total += depth
+    
+    def as_dict(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'items': self.items,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'queue_size': self.queue_size,
+            'max_queue_depth': self.max_queue_depth,
+            'mean_queue_depth': round(self._depth_total / self.items, 2) if self.items else 0.0
+        }
+
+
+def merge_stage_stats(parts: List[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """Combine the stage stats of pipelines that ran side by side (one per segment)."""
+    merged = {}
+    for part in parts:
+        for name, stage in part.items():
+            if name not in merged:
+                merged[name] = dict(stage, mean_queue_depth=0.0)
+                continue
+            total = merged[name]
+            for key in ('workers', 'items', 'busy_seconds'):
+                total[key] += stage[key]
+            total['max_queue_depth'] = max(total['max_queue_depth'], stage['max_queue_depth'])
+    
+    # Mean depth weighted by the items each pipeline pushed through the stage
+    for name, total in merged.items():
+        depth = sum(part[name]['mean_queue_depth'] * part[name]['items'] for part in parts if name in part)
+        total['busy_seconds'] = round(total['busy_seconds'], 3)
+        total['mean_queue_depth'] = round(depth / total['items'], 2) if total['items'] else 0.0
+    return merged
+
+
+class Pipeline:
+    """
+    Chain of stages running on threads, connected by bounded queues.
+    
+    Each stage pulls items from the previous stage (or a source iterable),
+    processes them on its own worker threads and hands results on through a
+    queue of at most queue_size items, so a slow stage stalls the ones
+    before it instead of letting work pile up in memory. Results leave each
+    stage in input order; a stage holds at most queue_size + workers items,
+    including results waiting behind a slower item. Exceptions in any stage are re-raised to the
+    consumer, and leaving the with block stops all stages.
+    
+    Example:
+        with Pipeline() as pipeline:
+            decoded = pipeline.stage('decode', frames)
+            detected = pipeline.stage('detect', decoded, detect, queue_size=2)
+            for result in detected:
+                ...
+    """
+    
+    def __init__(self):
+        self.stats: Dict[str, StageStats] = {}
+        self._stop = threading.Event()
+        self._threads = []
+    
+    def __enter__(self) -> 'Pipeline':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Stop all stages and wait for their threads."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+    
+    def stage(
+        self,
+        name: str,
+        items: Iterable,
+        work: Optional[Callable] = None,
+        workers: int = 1,
+        queue_size: int = 2
+    ) -> Iterator:
+        """
+        Start a stage and return an iterator over its results, in input order.
+        
+        Args:
+            name: Stage name for stats and thread names
+            items: Input iterable, usually the iterator of the previous stage
+            work: Function applied to each item; None passes items through, and
+                the time spent producing them counts as the stage's work
+            workers: Threads running work concurrently
+            queue_size: Results buffered for the next stage
+        """
+        workers = max(1, workers) if work is not None else 1
+        queue_size = max(1, queue_size)
+        stats = self.stats[name] = StageStats(name, workers, queue_size)
+        output = queue.Queue(maxsize=queue_size)
+        
+        # Workers share one input iterator; sequence numbers restore the order
+        source = iter(items)
+        source_lock = threading.Lock()
+        slots = threading.Semaphore(queue_size + workers)
+        sequence = [0]
+        finished = [0]
+        
+        def run():
+            try:
+                while not self._stop.is_set():
+                    # Don't run ahead of a slow item by more than the stage may hold
+                    if not slots.acquire(timeout=POLL_INTERVAL):
+                        continue
+                    start = time.perf_counter()
+                    with source_lock:
+                        try:
+                            item = next(source)
+                        except StopIteration:
+                            slots.release()
+                            break
+                        index = sequence[0]
+                        sequence[0] += 1
+                    
+                    if work is not None:
+                        start = time.perf_counter()
+                        item = work(item)
+                    elapsed = time.perf_counter() - start
+                    
+                    self._put(output, (index, item))
+                    stats.record(elapsed, output.qsize())
+            except Exception as e:
+                self._put(output, (-1, _Failure(e)))
+            finally:
+                with source_lock:
+                    finished[0] += 1
+                    last = finished[0] == workers
+                if last:
+                    self._put(output, (sequence[0], _DONE))
+        
+        for worker in range(workers):
+            thread = threading.Thread(target=run, name=f"pipeline-{name}-{worker}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        
+        return self._ordered(output, slots)
+    
+    def stats_dict(self) -> Dict[str, Dict]:
+        """Stats of every stage, by stage name."""
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
+    
+    def _put(self, output: queue.Queue, item):
+        """Block until the item is queued or the pipeline stops."""
+        while not self._stop.is_set():
+            try:
+                output.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+    
+    def _ordered(self, output: queue.Queue, slots: threading.Semaphore) -> Iterator:
+        """Yield a stage's results by sequence number."""
+        pending = {}
+        expected = 0
+        while True:
+            while expected not in pending:
+                try:
+                    index, item = output.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    if self._stop.is_set():
+                        return
+                    continue
+                if isinstance(item, _Failure):
+                    raise item.error
+                pending[index] = item
+            
+            item = pending.pop(expected)
+            if item is _DONE:
+                return
+            slots.release()
+            yield item
+            expected += 1
@@ -0,0 +1,172 @@
+import time
+import redis
+import redis.asyncio
+from typing import Dict, Optional
+from app.core.config import settings
+from app.models.video import VideoStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The status endpoint reads these states from the database instead
+TERMINAL_STATUSES = (VideoStatus.COMPLETED, VideoStatus.FAILED)
+
+_client: Optional[redis.Redis] = None
+_async_client: Optional[redis.asyncio.Redis] = None
+
+
+def progress_key(video_id: str) -> str:
+    """Redis hash holding a job's progress."""
+    return f"video_progress:{video_id}"
+
+
+def get_redis() -> redis.Redis:
+    """This process's Redis client, created on first use."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.progress_redis_timeout,
+            socket_connect_timeout=settings.progress_redis_timeout
+        )
+    return _client
+
+
+class ProgressReporter:
+    """
+    Publish a job's progress to a Redis hash for the status endpoint.
+    
+    The hash holds status, stage, frames_done, frames_total, fps,
+    eta_seconds, started_at and updated_at. frames_done is incremented
+    atomically, so segment processes and chunk subtasks of one job all
+    report into the same hash; throughput and ETA are computed from the
+    hash after each increment. Updates are sent at most every
+    PROGRESS_INTERVAL seconds. Redis errors only stop the reporting, since
+    progress is never worth failing a job for. A reporter holds no
+    connection, so it can be pickled into segment processes.
+    """
+    
+    def __init__(self, video_id: str, interval: Optional[float] = None):
+        self.video_id = video_id
+        self.key = progress_key(video_id)
+        self.interval = settings.progress_interval if interval is None else interval
+        self._pending = 0
+        self._last_publish = 0.0
+        self._disabled = False
+    
+    def start(self, frames_total: int, stage: str = 'starting', status: str = VideoStatus.PROCESSING.value):
+        """
+        Reset the hash for a new job.
+        
+        Args:
+            frames_total: Frames the job will process (0 if unknown)
+            stage: Initial stage name
+            status: Video status to report
+        """
+        now = time.time()
+        fields = {
+            'status': status,
+            'stage': stage,
+            'frames_done': 0,
+            'frames_total': frames_total,
+            'fps': 0,
+            'eta_seconds': '',
+            'started_at': now,
+            'updated_at': now
+        }
+        
+        def reset(client):
+            pipeline = client.pipeline(transaction=True)
+            pipeline.delete(self.key)
+            pipeline.hset(self.key, mapping=fields)
+            pipeline.expire(self.key, settings.progress_ttl)
+            pipeline.execute()
+        
+        self._call(reset)
+    
+    def set_stage(self, stage: str):
+        """Report the step the job is in, e.g. 'analyzing' or 'saving'."""
+        self.flush()
+        self._call(lambda client: client.hset(self.key, mapping={'stage': stage, 'updated_at': time.time()}))
+    
+    def advance(self, frames: int = 1):
+        """Count processed frames, publishing once the interval has passed."""
+        self._pending += frames
+        if time.monotonic() - self._last_publish >= self.interval:
+            self.flush()
+    
+    def flush(self):
+        """Publish the frames counted since the last update."""
+        if not self._pending:
+            return
+        frames, self._pending = self._pending, 0
+        self._last_publish = time.monotonic()
+        self._call(lambda client: self._publish(client, frames))
+    
+    def finish(self):
+        """Drop the hash once the job reached a terminal state in the database."""
+        self._pending = 0
+        self._call(lambda client: client.delete(self.key))
+    
+    def _publish(self, client: redis.Redis, frames: int):
+        pipeline = client.pipeline(transaction=False)
+        pipeline.hincrby(self.key, 'frames_done', frames)
+        pipeline.hmget(self.key, 'frames_total', 'started_at')
+        done, (total, started_at) = pipeline.execute()
+        
+        # Throughput of the whole job, whichever process started it
+        now = time.time()
+        total = int(total or 0)
+        elapsed = now - float(started_at or now)
+        fps = done / elapsed if elapsed > 0 else 0.0
+        
+        pipeline = client.pipeline(transaction=False)
+        pipeline.hset(self.key, mapping={
+            'fps': round(fps, 2),
+            'eta_seconds': round(max(0, total - done) / fps, 1) if total and fps else '',
+            'updated_at': now
+        })
+        pipeline.expire(self.key, settings.progress_ttl)
+        pipeline.execute()
+    
+    def _call(self, operation):
+        if self._disabled:
+            return
+        try:
+            operation(get_redis())
+        except redis.RedisError as e:
+            self._disabled = True
+            logger.warning(f"Progress reporting for {self.video_id} disabled: {str(e)}")
+
+
+async def read_progress(video_id: str) -> Optional[Dict]:
+    """
+    Progress of a job from Redis, without blocking the event loop.
+    
+    Returns:
+        The progress hash with numeric fields converted, or None if there is
+        none or Redis is unreachable
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = redis.asyncio.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=settings.progress_redis_timeout,
+            socket_connect_timeout=settings.progress_redis_timeout
+        )
+    
+    try:
+        progress = await _async_client.hgetall(progress_key(video_id))
+    except redis.RedisError as e:
+        logger.warning(f"Could not read progress of {video_id}: {str(e)}")
+        return None
+    if not progress:
+        return None
+    
+    for field in ('frames_done', 'frames_total'):
+        progress[field] = int(progress.get(field) or 0)
+    for field in ('fps', 'eta_seconds', 'started_at', 'updated_at'):
+        progress[field] = float(progress[field]) if progress.get(field) else None
+    return progress
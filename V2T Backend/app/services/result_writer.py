@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional
+from app.core.database import SessionLocal
+from app.models.video import DetectedObject, ObjectTrack, ExtractedText
+from app.services.detections import Detections
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ResultWriter:
+    """
+    Write a job's detections and texts to the database while it runs.
+    
+    Frame results are buffered and written in one transaction per
+    batch_frames frames, so they can be queried while the video is still
+    processing, a failure keeps everything written before it, and memory
+    doesn't grow with the video length. A writer opens a session only to
+    flush, so it can be pickled into segment processes, each writing its
+    own frames.
+    """
+    
+    def __init__(
+        self,
+        video_id: str,
+        batch_frames: int = 100,
+        save_detections: bool = True,
+        keep_detections: bool = False
+    ):
+        """
+        Args:
+            video_id: Video the rows belong to
+            batch_frames: Frames buffered per write
+            save_detections: Write per-frame detections (not only texts)
+            keep_detections: Also return detections to the caller, for
+                tracking once all frames are processed
+        """
+        self.video_id = video_id
+        self.batch_frames = max(1, batch_frames)
+        self.save_detections = save_detections
+        self.keep_detections = keep_detections
+        self.detections_written = 0
+        self.texts_written = 0
+        self._detections: List[Detections] = []
+        self._texts: List[Dict] = []
+        self._frames = 0
+    
+    def add(self, detections: Optional[Detections], text: Optional[Dict]):
+        """Buffer one frame's detections and text record, writing the batch once it is full."""
+        if detections is not None and len(detections) and self.save_detections:
+            self._detections.append(detections)
+        if text:
+            self._texts.append(text)
+        
+        self._frames += 1
+        if self._frames >= self.batch_frames:
+            self.flush()
+    
+    def flush(self):
+        """Write the buffered results in one transaction."""
+        self._frames = 0
+        if not self._detections and not self._texts:
+            return
+        
+        records = Detections.concatenate(self._detections).to_records(self.video_id)
+        db = SessionLocal()
+        try:
+            db.bulk_insert_mappings(DetectedObject, records)
+            db.bulk_insert_mappings(ExtractedText, [
+                {
+                    'video_id': self.video_id,
+                    'frame_number': text['frame_number'],
+                    'timestamp': text['timestamp'],
+                    'text_content': text['text'],
+                    'confidence': text.get('confidence')
+                }
+                for text in self._texts
+            ])
+            db.commit()
+        finally:
+            db.close()
+        
+        self.detections_written += len(records)
+        self.texts_written += len(self._texts)
+        self._detections = []
+        self._texts = []
+    
+    @staticmethod
+    def clear(video_id: str):
+        """Delete results left by an earlier run of the same video (e.g. a redelivered task)."""
+        db = SessionLocal()
+        try:
+            for model in (DetectedObject, ObjectTrack, ExtractedText):
+                deleted = db.query(model).filter(model.video_id == video_id).delete(synchronize_session=False)
+                if deleted:
+                    logger.info(f"Deleted {deleted} {model.__tablename__} rows of an earlier run of {video_id}")
+            db.commit()
+        finally:
+            db.close()
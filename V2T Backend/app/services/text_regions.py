@@ -0,0 +1,342 @@
+import cv2
+import threading
+import numpy as np
+from typing import List, Optional, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# none OCRs whole frames; the others propose regions and OCR only those
+TEXT_REGION_METHODS = ('none', 'gradient', 'mser', 'east')
+
+# Candidate boxes outside these bounds (pixels / fraction of frame height) are not text
+MIN_TEXT_HEIGHT = 8
+MIN_TEXT_WIDTH = 8
+MAX_TEXT_HEIGHT_FRACTION = 0.3
+
+# Gradient strength below this is noise or compression artifacts, not glyph edges
+MIN_EDGE_STRENGTH = 40
+
+# Padding around merged regions so Tesseract sees some background
+REGION_PADDING = 4
+
+EAST_OUTPUT_LAYERS = ('feature_fusion/Conv_7/Sigmoid', 'feature_fusion/concat_3')
+EAST_MAX_SIZE = 1280
+EAST_MIN_SCORE = 0.5
+
+Region = Tuple[int, int, int, int]  # x, y, width, height in image pixels
+NormalizedRect = Tuple[float, float, float, float]  # x, y, width, height as fractions of the frame
+
+# Auto ROI: frame height is split into this many rows when looking for text bands
+BAND_BINS = 100
+BAND_PADDING = 0.02
+
+# cv2.dnn nets keep their input and outputs between setInput and forward, so
+# OCR threads each load their own
+_east_nets = threading.local()
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+
+def _plausible(width: int, height: int, image_height: int) -> bool:
+    return (
+        width >= MIN_TEXT_WIDTH
+        and MIN_TEXT_HEIGHT <= height <= image_height * MAX_TEXT_HEIGHT_FRACTION
+    )
+
+
+def gradient_boxes(image: np.ndarray) -> List[Region]:
+    """
+    Candidate text boxes from a morphological gradient.
+    
+    Glyphs produce dense, strong edges; closing the edge map horizontally
+    joins the letters of a word or line into one blob.
+    """
+    gray = _to_gray(image)
+    height, width = gray.shape[:2]
+    
+    gradient = cv2.morphologyEx(
+        gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+    )
+    otsu, _ = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    _, edges = cv2.threshold(gradient, max(otsu, MIN_EDGE_STRENGTH), 255, cv2.THRESH_BINARY)
+    
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(9, width // 80), 1))
+    connected = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
+    contours = cv2.findContours(connected, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+    
+    boxes = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if not _plausible(w, h, height):
+            continue
+        # Text fills a good part of its box with edges, unlike lone lines or outlines
+        fill = cv2.countNonZero(edges[y:y + h, x:x + w]) / float(w * h)
+        if 0.15 <= fill <= 0.95:
+            boxes.append((x, y, w, h))
+    return boxes
+
+
+def mser_boxes(image: np.ndarray) -> List[Region]:
+    """Candidate character boxes from MSER (maximally stable extremal regions)."""
+    gray = _to_gray(image)
+    height, width = gray.shape[:2]
+    
+    mser = cv2.MSER_create()
+    mser.setMinArea(MIN_TEXT_HEIGHT * 4)
+    mser.setMaxArea(max(MIN_TEXT_HEIGHT * 4 + 1, int(height * width * 0.01)))
+    mser.setMaxVariation(0.5)
+    # A light blur keeps sensor noise from breaking up stable glyph regions
+    _, bboxes = mser.detectRegions(cv2.GaussianBlur(gray, (3, 3), 0))
+    
+    return [
+        (int(x), int(y), int(w), int(h))
+        for x, y, w, h in bboxes
+        # Characters are not much wider than tall
+        if h >= MIN_TEXT_HEIGHT and h <= height * MAX_TEXT_HEIGHT_FRACTION and w <= h * 5
+    ]
+
+
+def east_boxes(image: np.ndarray, model_path: str) -> List[Region]:
+    """Candidate text boxes from the EAST detector (frozen_east_text_detection.pb)."""
+    nets = vars(_east_nets)
+    if model_path not in nets:
+        nets[model_path] = cv2.dnn.readNet(model_path)
+    net = nets[model_path]
+    
+    bgr = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR) if image.ndim == 2 else image
+    height, width = bgr.shape[:2]
+    
+    # EAST needs input dimensions that are multiples of 32
+    ratio = min(1.0, EAST_MAX_SIZE / max(height, width))
+    input_width = max(32, int(round(width * ratio / 32)) * 32)
+    input_height = max(32, int(round(height * ratio / 32)) * 32)
+    
+    blob = cv2.dnn.blobFromImage(
+        bgr, 1.0, (input_width, input_height), (123.68, 116.78, 103.94), swapRB=True, crop=False
+    )
+    net.setInput(blob)
+    scores, geometry = net.forward(list(EAST_OUTPUT_LAYERS))
+    
+    # Each output cell covers 4x4 input pixels and predicts distances to the box edges
+    ys, xs = np.nonzero(scores[0, 0] >= EAST_MIN_SCORE)
+    if not len(ys):
+        return []
+    
+    top, right, bottom, left, angle = (geometry[0, i, ys, xs] for i in range(5))
+    cos, sin = np.cos(angle), np.sin(angle)
+    end_x = xs * 4.0 + cos * right + sin * bottom
+    end_y = ys * 4.0 - sin * right + cos * bottom
+    box_w = left + right
+    box_h = top + bottom
+    
+    rects = [
+        [int(x), int(y), int(w), int(h)]
+        for x, y, w, h in zip(end_x - box_w, end_y - box_h, box_w, box_h)
+    ]
+    confidences = scores[0, 0, ys, xs].astype(float).tolist()
+    keep = np.array(cv2.dnn.NMSBoxes(rects, confidences, EAST_MIN_SCORE, 0.4)).reshape(-1)
+    
+    scale_x, scale_y = width / input_width, height / input_height
+    return [
+        (
+            int(rects[i][0] * scale_x),
+            int(rects[i][1] * scale_y),
+            int(rects[i][2] * scale_x),
+            int(rects[i][3] * scale_y)
+        )
+        for i in keep
+    ]
+
+
+def merge_regions(boxes: List[Region], shape: Tuple[int, int]) -> List[Region]:
+    """
+    Merge overlapping and horizontally adjacent boxes into text-line regions.
+    
+    Returns:
+        Padded regions clipped to the image, in reading order
+    """
+    height, width = shape[:2]
+    mask = np.zeros((height, width), dtype=np.uint8)
+    for x, y, w, h in boxes:
+        cv2.rectangle(
+            mask,
+            (max(0, x - REGION_PADDING), max(0, y - REGION_PADDING)),
+            (min(width - 1, x + w + REGION_PADDING), min(height - 1, y + h + REGION_PADDING)),
+            255,
+            thickness=-1
+        )
+    
+    # Join neighbouring words on the same line
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(9, width // 60), 1))
+    mask = cv2.dilate(mask, kernel)
+    contours = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+    
+    regions = [cv2.boundingRect(contour) for contour in contours]
+    return sorted(regions, key=lambda region: (region[1], region[0]))
+
+
+def find_text_regions(
+    image: np.ndarray,
+    method: str = 'gradient',
+    east_model_path: str = '',
+    max_coverage: float = 0.5
+) -> List[Region]:
+    """
+    Propose the parts of a frame worth running OCR on.
+    
+    Args:
+        image: Grayscale or BGR frame
+        method: One of TEXT_REGION_METHODS
+        east_model_path: EAST weights, required for the 'east' method
+        max_coverage: When regions cover more than this fraction of the frame,
+            return the whole frame as one region instead
+    
+    Returns:
+        Regions as (x, y, width, height) in reading order; empty when the
+        frame has no text candidates
+    """
+    height, width = image.shape[:2]
+    if method == 'none':
+        return [(0, 0, width, height)]
+    
+    if method == 'east' and not east_model_path:
+        logger.warning("EAST text detection needs east_model_path; using gradient regions")
+        method = 'gradient'
+    
+    if method == 'gradient':
+        boxes = gradient_boxes(image)
+    elif method == 'mser':
+        boxes = mser_boxes(image)
+    elif method == 'east':
+        boxes = east_boxes(image, east_model_path)
+    else:
+        raise ValueError(f"Unknown text region method: {method}")
+    
+    if not boxes:
+        return []
+    
+    regions = merge_regions(boxes, image.shape)
+    covered = sum(w * h for _, _, w, h in regions)
+    if covered > max_coverage * width * height:
+        # One full-frame call beats many crops covering most of it
+        return [(0, 0, width, height)]
+    return regions
+
+
+def clip_regions(regions: List[Region], areas: List[Region]) -> List[Region]:
+    """Intersect regions with areas of interest, dropping what falls outside them."""
+    clipped = []
+    for x, y, w, h in regions:
+        for area_x, area_y, area_w, area_h in areas:
+            x1, y1 = max(x, area_x), max(y, area_y)
+            x2, y2 = min(x + w, area_x + area_w), min(y + h, area_y + area_h)
+            if x2 > x1 and y2 > y1:
+                clipped.append((x1, y1, x2 - x1, y2 - y1))
+    return sorted(clipped, key=lambda region: (region[1], region[0]))
+
+
+def parse_rois(spec: Optional[Union[str, List]]) -> Optional[Union[str, List[NormalizedRect]]]:
+    """
+    Parse an OCR region-of-interest job option.
+    
+    Args:
+        spec: '' or None for whole frames, 'auto', rectangles as
+            'x,y,width,height;x,y,width,height' in 0-1 frame coordinates,
+            or a list of such 4-sequences
+    
+    Returns:
+        None, 'auto' or a list of (x, y, width, height) tuples
+    
+    Raises:
+        ValueError: If a rectangle is malformed or leaves the frame
+    """
+    if isinstance(spec, str):
+        spec = spec.strip().lower()
+        if spec == 'auto':
+            return 'auto'
+        spec = [part.split(',') for part in spec.split(';') if part.strip()]
+    if not spec:
+        return None
+    
+    rois = []
+    for rect in spec:
+        try:
+            x, y, width, height = (float(value) for value in rect)
+        except (TypeError, ValueError):
+            raise ValueError(f"ROI must be x,y,width,height: {rect}")
+        if x < 0 or y < 0 or width <= 0 or height <= 0 or x + width > 1.001 or y + height > 1.001:
+            raise ValueError(f"ROI must lie inside the frame in 0-1 coordinates: {rect}")
+        rois.append((x, y, min(width, 1 - x), min(height, 1 - y)))
+    return rois
+
+
+def roi_pixels(rois: List[NormalizedRect], width: int, height: int) -> List[Region]:
+    """Convert normalized rectangles to pixel regions of a width x height frame."""
+    regions = []
+    for x, y, w, h in rois:
+        x1, y1 = int(x * width), int(y * height)
+        x2, y2 = min(width, int(np.ceil((x + w) * width))), min(height, int(np.ceil((y + h) * height)))
+        if x2 > x1 and y2 > y1:
+            regions.append((x1, y1, x2 - x1, y2 - y1))
+    return regions
+
+
+def find_text_bands(
+    images: List[np.ndarray],
+    method: str = 'gradient',
+    east_model_path: str = '',
+    min_presence: float = 0.3
+) -> List[NormalizedRect]:
+    """
+    Find the horizontal bands where text keeps appearing across a video.
+    
+    Text regions are proposed on each sample frame; rows holding text in at
+    least min_presence of the frames form bands (subtitles, tickers, slide
+    bodies). Each band spans the horizontal extent of the text seen in it.
+    
+    Args:
+        images: Grayscale sample frames of one video
+        method: Region proposal method (one of TEXT_REGION_METHODS except 'none')
+        east_model_path: EAST weights, for the 'east' method
+        min_presence: Fraction of sample frames a row must hold text in
+    
+    Returns:
+        Bands as normalized (x, y, width, height), top to bottom; empty if
+        no text shows up consistently
+    """
+    if not images:
+        return []
+    if method == 'none':
+        method = 'gradient'
+    
+    presence = np.zeros(BAND_BINS)
+    boxes = []
+    for image in images:
+        height, width = image.shape[:2]
+        rows = np.zeros(BAND_BINS, dtype=bool)
+        for x, y, w, h in find_text_regions(image, method, east_model_path, max_coverage=1.0):
+            top, bottom = y / height, (y + h) / height
+            rows[int(top * BAND_BINS):int(np.ceil(bottom * BAND_BINS))] = True
+            boxes.append((x / width, top, (x + w) / width, bottom))
+        presence += rows
+    
+    stable = np.append(presence >= min_presence * len(images), False)
+    bands = []
+    start = None
+    for row, is_text in enumerate(stable):
+        if is_text and start is None:
+            start = row
+        elif not is_text and start is not None:
+            top = max(0.0, start / BAND_BINS - BAND_PADDING)
+            bottom = min(1.0, row / BAND_BINS + BAND_PADDING)
+            
+            # Horizontal extent of the text whose centre falls inside the band
+            inside = [box for box in boxes if top <= (box[1] + box[3]) / 2 <= bottom]
+            left = max(0.0, min(box[0] for box in inside) - BAND_PADDING) if inside else 0.0
+            right = min(1.0, max(box[2] for box in inside) + BAND_PADDING) if inside else 1.0
+            bands.append((left, top, right - left, bottom - top))
+            start = None
+    return bands
@@ -0,0 +1,151 @@
+import numpy as np
+from typing import Dict, List
+from app.services.detections import Detections, match_boxes
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IoUTracker:
+    """
+    Link detections across frames into tracks by bounding-box overlap.
+    
+    A detection continues the open track of the same class whose latest box
+    overlaps it most, if the IoU reaches iou_threshold; otherwise it starts a
+    new track. Tracks not seen for more than max_gap seconds are closed, so
+    an object that briefly goes undetected keeps its track.
+    """
+    
+    def __init__(self, iou_threshold: float = 0.3, max_gap: float = 2.0):
+        self.iou_threshold = iou_threshold
+        self.max_gap = max_gap
+        self.open_tracks: List[Dict] = []
+        self.closed_tracks: List[Dict] = []
+        self._next_id = 1
+    
+    def update(self, detections: Detections, frame_number: int, timestamp: float):
+        """
+        Add the detections of one frame; frames must arrive in timestamp order.
+        
+        Args:
+            detections: Boxes detected in the frame
+            frame_number: Frame the detections belong to
+            timestamp: Frame timestamp in seconds
+        """
+        still_open = []
+        for track in self.open_tracks:
+            if timestamp - track['last_timestamp'] > self.max_gap:
+                self.closed_tracks.append(track)
+            else:
+                still_open.append(track)
+        self.open_tracks = still_open
+        
+        matched = set()
+        if self.open_tracks and len(detections):
+            last_boxes = np.array([track['last_box'] for track in self.open_tracks], dtype=np.float32)
+            class_ids = np.array([track['class_id'] for track in self.open_tracks], dtype=np.int32)
+            pairs = match_boxes(
+                detections.boxes, detections.class_ids, last_boxes, class_ids, self.iou_threshold
+            )
+            for i, j, _ in pairs:
+                self._extend(self.open_tracks[j], detections, i, frame_number, timestamp)
+                matched.add(i)
+        
+        class_names = detections.class_names()
+        for i in range(len(detections)):
+            if i not in matched:
+                self.open_tracks.append(
+                    self._start(detections, i, class_names[i], frame_number, timestamp)
+                )
+    
+    def finish(self) -> List[Dict]:
+        """Close all tracks and return them ordered by first appearance."""
+        self.closed_tracks.extend(self.open_tracks)
+        self.open_tracks = []
+        tracks = sorted(self.closed_tracks, key=lambda track: (track['first_timestamp'], track['track_id']))
+        return [
+            {key: value for key, value in track.items() if key not in ('class_id', 'last_box')}
+            for track in tracks
+        ]
+    
+    def _start(
+        self,
+        detections: Detections,
+        index: int,
+        class_name: str,
+        frame_number: int,
+        timestamp: float
+    ) -> Dict:
+        x1, y1, x2, y2 = detections.boxes[index].tolist()
+        track = {
+            'track_id': self._next_id,
+            'class_id': int(detections.class_ids[index]),
+            'object_class': class_name,
+            'first_frame': frame_number,
+            'last_frame': frame_number,
+            'first_timestamp': timestamp,
+            'last_timestamp': timestamp,
+            'detection_count': 1,
+            'peak_confidence': float(detections.confidences[index]),
+            'bbox_x1': x1,
+            'bbox_y1': y1,
+            'bbox_x2': x2,
+            'bbox_y2': y2,
+            'last_box': detections.boxes[index]
+        }
+        self._next_id += 1
+        return track
+    
+    @staticmethod
+    def _extend(track: Dict, detections: Detections, index: int, frame_number: int, timestamp: float):
+        track['last_frame'] = frame_number
+        track['last_timestamp'] = timestamp
+        track['detection_count'] += 1
+        track['last_box'] = detections.boxes[index]
+        
+        # The representative box is the one seen with the highest confidence
+        confidence = float(detections.confidences[index])
+        if confidence > track['peak_confidence']:
+            track['peak_confidence'] = confidence
+            track['bbox_x1'], track['bbox_y1'], track['bbox_x2'], track['bbox_y2'] = (
+                detections.boxes[index].tolist()
+            )
+
+
+def track_detections(
+    detections: Detections,
+    iou_threshold: float = 0.3,
+    max_gap: float = 2.0
+) -> List[Dict]:
+    """
+    Collapse per-frame detections of a whole video into tracks.
+    
+    Args:
+        detections: Detections of all frames, in frame order
+        iou_threshold: Minimum IoU to continue a track
+        max_gap: Seconds a track may go undetected before it is closed
+    
+    Returns:
+        One record per track with the object_tracks columns (minus video_id)
+    """
+    tracker = IoUTracker(iou_threshold, max_gap)
+    if not len(detections):
+        return []
+    
+    # Rows are grouped by frame; split wherever the frame number changes
+    boundaries = np.flatnonzero(np.diff(detections.frame_numbers)) + 1
+    starts = np.concatenate(([0], boundaries))
+    stops = np.concatenate((boundaries, [len(detections)]))
+    
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        frame = Detections(
+            detections.boxes[start:stop],
+            detections.class_ids[start:stop],
+            detections.confidences[start:stop],
+            names=detections.names
+        )
+        tracker.update(frame, int(detections.frame_numbers[start]), float(detections.timestamps[start]))
+    
+    tracks = tracker.finish()
+    logger.info(f"Linked {len(detections)} detections into {len(tracks)} tracks")
+    return tracks
@@ -2,35 +2,95 @@ import os
 import cv2
 import uuid
 import ffmpeg
-import pytesseract
 import numpy as np
-from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+import billiard
+from typing import List, Tuple, Dict, Iterable, Iterator, Optional, Union
 from datetime import datetime
-from ultralytics import YOLO
-from PIL import Image
 from app.core.config import settings
+from app.core.worker_topology import plan_topology, apply_thread_limits
+from app.services.detections import Detections
+from app.services.tracking import track_detections
+from app.services.frame_cache import DetectionCache, OCRCache
+from app.services.pipeline import Pipeline, merge_stage_stats
+from app.services.result_writer import ResultWriter
+from app.services.progress import ProgressReporter
+from app.services.ocr_engines import image_to_data
+from app.services.text_regions import find_text_regions, find_text_bands, clip_regions, parse_rois, roi_pixels
+from app.services.ocr_preprocessing import parse_preprocessing, preprocess_for_ocr
+from app.services.detection_backends import load_detection_model, resolve_imgsz, DYNAMIC_SHAPE_BACKENDS
+from app.services.frame_sources import (
+    VideoFrame, SceneChangeDetector, create_frame_source, save_frames,
+    count_sampled_frames, plan_segments
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Frames can be passed as an image path, a decoded BGR array or a VideoFrame
+FrameInput = Union[str, np.ndarray, VideoFrame]
+
 
 class VideoProcessingService:
-    """Service for processing videos: frame extraction, object detection, and OCR."""
+    """
+    Service for processing videos: frame extraction, object detection, and OCR.
+    
+    Models are loaded lazily, once per process, on first use or from the
+    Celery worker_process_init hook. Creating the service is cheap and never
+    imports torch, so the API process can use it freely.
+    """
     
-    def __init__(self):
+    def __init__(self, detection_backend: Optional[str] = None, quantization: Optional[str] = None):
+        self.detection_backend = detection_backend or settings.detection_backend
+        self.quantization = quantization or settings.yolo_quantization
         self.yolo_model = None
-        self._load_yolo_model()
+        self._models_loaded = False
+    
+    def load_models(self):
+        """Load the YOLO model on first call; later calls return the loaded model."""
+        if not self._models_loaded:
+            self._models_loaded = True
+            self._load_yolo_model()
+        return self.yolo_model
     
     def _load_yolo_model(self):
         """Load YOLO model for object detection."""
         try:
-            # Load YOLOv8 pretrained model
-            self.yolo_model = YOLO('yolov8n.pt')  # Using nano model for speed
-            logger.info("YOLO model loaded successfully")
+            self.yolo_model = load_detection_model(
+                settings.yolo_weights,
+                self.detection_backend,
+                self.quantization,
+                settings.quantization_calibration_path,
+                settings.quantization_calibration_frames
+            )
+            logger.info(
+                f"YOLO model loaded successfully ({self.detection_backend} backend, "
+                f"quantization: {self.quantization})"
+            )
         except Exception as e:
-            logger.error(f"Failed to load YOLO model: {str(e)}")
+            logger.error(f"Failed to load YOLO model with {self.detection_backend} backend: {str(e)}")
             self.yolo_model = None
+            
+            # An export or runtime problem shouldn't take detection down entirely
+            if self.detection_backend != 'pytorch' or self.quantization != 'none':
+                try:
+                    self.yolo_model = load_detection_model(settings.yolo_weights, 'pytorch')
+                    self.detection_backend = 'pytorch'
+                    self.quantization = 'none'
+                    logger.info("YOLO model loaded successfully (pytorch fallback)")
+                except Exception as e:
+                    logger.error(f"Failed to load YOLO model: {str(e)}")
+    
+    def warm_up(self):
+        """Run one dummy inference so the first real frame doesn't pay for lazy initialization."""
+        model = self.load_models()
+        if model is None:
+            return
+        
+        try:
+            model(np.zeros((640, 640, 3), dtype=np.uint8), verbose=False)
+            logger.info("YOLO model warmed up")
+        except Exception as e:
+            logger.error(f"YOLO warm-up failed: {str(e)}")
     
     @staticmethod
     def generate_video_id() -> str:
@@ -60,155 +120,288 @@ class VideoProcessingService:
             logger.error(f"Failed to extract video metadata: {str(e)}")
             return {}
     
+    @staticmethod
+    def iter_frames(
+        video_path: str,
+        interval: int = 1,
+        strategy: str = 'auto',
+        output_dir: Optional[str] = None,
+        source: str = 'opencv',
+        max_size: Optional[int] = None,
+        sampling_mode: str = 'fixed',
+        keyframe_min_spacing: float = 0.0,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Iterator[VideoFrame]:
+        """
+        Stream sampled frames as decoded arrays.
+        
+        Args:
+            video_path: Path to the video file
+            interval: Sample one frame every N seconds
+            strategy: Sampling strategy ('auto', 'grab' or 'seek')
+            output_dir: Also write frames as JPEGs here (optional)
+            source: Frame decoder ('opencv' or 'ffmpeg')
+            max_size: Downscale frames to at most this many pixels on the longest side
+            sampling_mode: 'fixed' interval or encoder 'keyframes' only
+            keyframe_min_spacing: Minimum seconds between keyframes in 'keyframes' mode
+            start: First frame number to yield (for decoding a segment)
+            stop: Frame number to stop before (None: end of video)
+        
+        Returns:
+            Iterator of VideoFrame objects in timestamp order
+        """
+        frames = iter(create_frame_source(
+            video_path,
+            interval,
+            source,
+            strategy,
+            max_size,
+            sampling_mode=sampling_mode,
+            keyframe_min_spacing=keyframe_min_spacing,
+            start=start,
+            stop=stop
+        ))
+        if output_dir:
+            frames = save_frames(frames, output_dir)
+        return frames
+    
     def extract_frames(
         self, 
         video_path: str, 
         output_dir: str, 
-        interval: int = 1
+        interval: int = 1,
+        strategy: str = 'auto',
+        sampling_mode: str = 'fixed',
+        keyframe_min_spacing: float = 0.0
     ) -> List[Tuple[int, str, float]]:
         """
         Extract frames from video at specified interval.
         
+        Only the kept frames are fully decoded: skipped frames are grabbed
+        without retrieval, and long gaps are crossed with keyframe seeks.
+        In 'keyframes' mode only the encoder's I-frames are decoded instead.
+        
         Args:
             video_path: Path to the video file
             output_dir: Directory to save extracted frames
             interval: Extract frame every N seconds
-            
+            strategy: Sampling strategy ('auto', 'grab' or 'seek')
+            sampling_mode: 'fixed' interval or encoder 'keyframes' only
+            keyframe_min_spacing: Minimum seconds between keyframes in 'keyframes' mode
+        
         Returns:
             List of tuples (frame_number, frame_path, timestamp)
         """
         try:
-            Path(output_dir).mkdir(parents=True, exist_ok=True)
-            
-            cap = cv2.VideoCapture(video_path)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_interval = int(fps * interval)
-            
-            frames_data = []
-            frame_count = 0
-            saved_count = 0
-            
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                if frame_count % frame_interval == 0:
-                    timestamp = frame_count / fps
-                    frame_filename = f"frame_{saved_count:06d}.jpg"
-                    frame_path = os.path.join(output_dir, frame_filename)
-                    
-                    cv2.imwrite(frame_path, frame)
-                    frames_data.append((saved_count, frame_path, timestamp))
-                    saved_count += 1
-                
-                frame_count += 1
-            
-            cap.release()
-            logger.info(f"Extracted {saved_count} frames from video")
+            frames_data = [
+                (frame.frame_number, frame.path, frame.timestamp)
+                for frame in self.iter_frames(
+                    video_path,
+                    interval,
+                    strategy,
+                    output_dir,
+                    sampling_mode=sampling_mode,
+                    keyframe_min_spacing=keyframe_min_spacing
+                )
+            ]
+            logger.info(f"Extracted {len(frames_data)} frames from video")
             return frames_data
-            
+        
         except Exception as e:
             logger.error(f"Frame extraction failed: {str(e)}")
             return []
     
     def detect_objects(
         self, 
-        frame_path: str, 
+        frame: FrameInput, 
         confidence_threshold: float = 0.5
     ) -> List[Dict]:
         """
         Detect objects in a frame using YOLO.
         
         Args:
-            frame_path: Path to the frame image
+            frame: Frame image path, BGR array or VideoFrame
             confidence_threshold: Minimum confidence for detections
-            
+        
         Returns:
             List of detected objects with bounding boxes and labels
         """
-        if self.yolo_model is None:
-            logger.warning("YOLO model not loaded")
+        return self.detect_objects_batch([frame], confidence_threshold)[0].to_dicts(with_frames=False)
+    
+    def detect_objects_batch(
+        self,
+        frames: List[FrameInput],
+        confidence_threshold: float = 0.5,
+        batch_size: Optional[int] = None,
+        imgsz: Optional[int] = None
+    ) -> List[Detections]:
+        """
+        Detect objects in several frames, running them through YOLO as batches.
+        
+        Args:
+            frames: Frame image paths, BGR arrays or VideoFrames
+            confidence_threshold: Minimum confidence for detections
+            batch_size: Frames per inference call (default from settings)
+            imgsz: Inference image size (default: the model's)
+        
+        Returns:
+            One Detections per input frame, boxes in source pixels
+        """
+        if not frames:
             return []
         
+        if self.load_models() is None:
+            logger.warning("YOLO model not loaded")
+            return [Detections.empty() for _ in frames]
+        
+        batch_size = max(1, batch_size or settings.yolo_batch_size)
+        inference_options = {'conf': confidence_threshold, 'verbose': False}
+        if self.detection_backend not in DYNAMIC_SHAPE_BACKENDS:
+            # Static-shape exports only accept the batch and image size they were traced with
+            batch_size = 1
+            imgsz = None
+        elif imgsz:
+            inference_options['imgsz'] = imgsz
+        
         try:
-            # Run inference
-            results = self.yolo_model(frame_path, conf=confidence_threshold)
-            
-            detected_objects = []
-            for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    # Get bounding box coordinates
-                    x1, y1, x2, y2 = box.xyxy[0].tolist()
-                    
-                    # Get class and confidence
-                    cls = int(box.cls[0])
-                    conf = float(box.conf[0])
-                    class_name = result.names[cls]
-                    
-                    detected_objects.append({
-                        'class': class_name,
-                        'confidence': conf,
-                        'bbox': {
-                            'x1': x1,
-                            'y1': y1,
-                            'x2': x2,
-                            'y2': y2
-                        }
-                    })
-            
-            logger.info(f"Detected {len(detected_objects)} objects in frame")
-            return detected_objects
+            all_objects = []
+            for i in range(0, len(frames), batch_size):
+                batch = frames[i:i + batch_size]
+                
+                # Frames are downscaled to imgsz once, and boxes mapped back to source pixels
+                views = [
+                    frame.detector_view(imgsz) if isinstance(frame, VideoFrame) else (frame, 1.0)
+                    for frame in batch
+                ]
+                images = [image for image, _ in views]
+                scales = [scale for _, scale in views]
+                
+                # Run inference on the whole batch at once
+                results = self.yolo_model(images, **inference_options)
+                
+                for result, scale in zip(results, scales):
+                    all_objects.append(Detections.from_result(result, scale))
             
+            logger.info(
+                f"Detected {sum(len(objects) for objects in all_objects)} objects "
+                f"in {len(frames)} frames"
+            )
+            return all_objects
+        
         except Exception as e:
             logger.error(f"Object detection failed: {str(e)}")
-            return []
+            return [Detections.empty() for _ in frames]
+    
+    @staticmethod
+    def _recognize_region(crop: np.ndarray, language: str, steps: List[str]) -> List[Tuple]:
+        """
+        OCR one grayscale region crop.
+        
+        Returns:
+            (text, confidence, left, top, width, height) per word, in crop pixels
+        """
+        image, factor = preprocess_for_ocr(crop, steps, settings.ocr_text_height)
+        
+        # Perform OCR with detailed data
+        ocr_data = image_to_data(image, language, settings.ocr_engine, settings.ocr_pool_size)
+        
+        words = []
+        n_boxes = len(ocr_data['text'])
+        for i in range(n_boxes):
+            text = ocr_data['text'][i].strip()
+            conf = int(float(ocr_data['conf'][i]))
+            
+            if text and conf > 0:  # Only keep valid text with confidence
+                # Undo the preprocessing scale
+                words.append((
+                    text,
+                    conf,
+                    ocr_data['left'][i] / factor,
+                    ocr_data['top'][i] / factor,
+                    ocr_data['width'][i] / factor,
+                    ocr_data['height'][i] / factor
+                ))
+        return words
     
     def extract_text_ocr(
         self, 
-        frame_path: str,
-        language: str = 'eng'
+        frame: FrameInput,
+        language: str = 'eng',
+        preprocessing: Optional[str] = None,
+        ocr_cache: Optional[OCRCache] = None,
+        rois: Optional[List[Tuple[float, float, float, float]]] = None
     ) -> Dict:
         """
         Extract text from frame using Tesseract OCR.
         
+        Frames go to a pool of persistent Tesseract engines as arrays; the
+        pytesseract subprocess path is the fallback (see OCR_ENGINE). A cheap
+        text-region pass runs first (see TEXT_REGION_METHOD): frames without
+        candidate regions skip Tesseract, otherwise only the regions are read.
+        Each region is preprocessed in memory first (see OCR_PREPROCESSING).
+        Regions already in ocr_cache reuse their words without OCR. With
+        rois, text regions are clipped to those areas of the frame.
+        
         Args:
-            frame_path: Path to the frame image
+            frame: Frame image path, BGR array or VideoFrame
             language: OCR language (default: English)
-            
+            preprocessing: Comma-separated preprocessing steps (default from settings)
+            ocr_cache: Region results shared across frames of a job (optional)
+            rois: Normalized (x, y, width, height) areas to OCR (default: whole frame)
+        
         Returns:
             Dictionary with extracted text and confidence
         """
         try:
-            # Read image
-            image = Image.open(frame_path)
+            # Tesseract binarizes internally, so grayscale loses nothing
+            scale = 1.0
+            if isinstance(frame, VideoFrame):
+                scale = frame.scale
+                image = frame.gray
+            elif isinstance(frame, np.ndarray):
+                image = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+            else:
+                image = cv2.imread(frame, cv2.IMREAD_GRAYSCALE)
+                if image is None:
+                    raise ValueError(f"Could not read image: {frame}")
             
-            # Perform OCR with detailed data
-            ocr_data = pytesseract.image_to_data(
-                image, 
-                lang=language, 
-                output_type=pytesseract.Output.DICT
+            steps = parse_preprocessing(
+                settings.ocr_preprocessing if preprocessing is None else preprocessing
+            )
+            regions = find_text_regions(
+                image,
+                settings.text_region_method,
+                settings.east_model_path,
+                settings.text_region_max_coverage
             )
+            if rois:
+                regions = clip_regions(regions, roi_pixels(rois, image.shape[1], image.shape[0]))
             
             # Extract text with confidence
             texts = []
             confidences = []
             bboxes = []
             
-            n_boxes = len(ocr_data['text'])
-            for i in range(n_boxes):
-                text = ocr_data['text'][i].strip()
-                conf = int(ocr_data['conf'][i])
+            for x, y, width, height in regions:
+                crop = image[y:y + height, x:x + width]
                 
-                if text and conf > 0:  # Only keep valid text with confidence
+                key = ocr_cache.key(crop) if ocr_cache is not None else None
+                words = ocr_cache.get(key) if key is not None else None
+                if words is None:
+                    words = self._recognize_region(crop, language, steps)
+                    if key is not None:
+                        ocr_cache.put(key, words)
+                
+                for text, conf, left, top, word_width, word_height in words:
                     texts.append(text)
                     confidences.append(conf)
+                    # Crop offset back to frame space, then to original resolution
                     bboxes.append({
-                        'x': ocr_data['left'][i],
-                        'y': ocr_data['top'][i],
-                        'width': ocr_data['width'][i],
-                        'height': ocr_data['height'][i]
+                        'x': round((left + x) * scale),
+                        'y': round((top + y) * scale),
+                        'width': round(word_width * scale),
+                        'height': round(word_height * scale)
                     })
             
             combined_text = ' '.join(texts)
@@ -225,7 +418,7 @@ class VideoProcessingService:
                 logger.info(f"Extracted {len(texts)} words from frame")
             
             return result
-            
+        
         except Exception as e:
             logger.error(f"OCR extraction failed: {str(e)}")
             return {
@@ -235,77 +428,581 @@ class VideoProcessingService:
                 'bboxes': []
             }
     
+    @staticmethod
+    def create_scene_detector(sampling_mode: str) -> Optional[SceneChangeDetector]:
+        """Scene change detector for 'adaptive' sampling, None for other modes."""
+        if sampling_mode == 'adaptive':
+            return SceneChangeDetector(
+                threshold=settings.scene_change_threshold,
+                max_gap=settings.scene_change_max_gap,
+                method=settings.scene_change_method
+            )
+        if sampling_mode not in ('fixed', 'keyframes'):
+            raise ValueError(f"Unknown sampling mode: {sampling_mode}")
+        return None
+    
+    @staticmethod
+    def create_detection_cache() -> Optional[DetectionCache]:
+        """Temporal detection cache, or None when disabled in settings."""
+        if not settings.detection_cache:
+            return None
+        return DetectionCache(
+            threshold=settings.detection_cache_threshold,
+            max_age=settings.detection_cache_max_age
+        )
+    
+    def find_ocr_rois(
+        self,
+        video_path: str,
+        duration: float,
+        frame_source: str,
+        max_size: Optional[int] = None
+    ) -> Optional[List[Tuple[float, float, float, float]]]:
+        """
+        Find where a video keeps its text (subtitle band, ticker, slide area).
+        
+        Samples OCR_ROI_SAMPLE_FRAMES frames spread over the video and keeps
+        the bands that hold text in at least OCR_ROI_MIN_PRESENCE of them.
+        
+        Returns:
+            Normalized (x, y, width, height) bands, or None to OCR whole frames
+        """
+        samples = max(1, settings.ocr_roi_sample_frames)
+        interval = max(1, int(duration // samples)) if duration else 1
+        
+        images = []
+        for frame in create_frame_source(video_path, interval, source=frame_source, max_size=max_size):
+            images.append(frame.gray)
+            if len(images) >= samples:
+                break
+        
+        bands = find_text_bands(
+            images, settings.text_region_method, settings.east_model_path, settings.ocr_roi_min_presence
+        )
+        if not bands:
+            logger.info(f"No stable text band in {len(images)} sample frames; OCR uses whole frames")
+            return None
+        
+        coverage = sum(width * height for _, _, width, height in bands)
+        logger.info(f"OCR limited to {len(bands)} text bands covering {coverage:.0%} of the frame: {bands}")
+        return bands
+    
+    @staticmethod
+    def create_ocr_cache() -> Optional[OCRCache]:
+        """Region OCR cache for one job, or None when disabled in settings."""
+        if not settings.ocr_cache:
+            return None
+        return OCRCache(max_entries=settings.ocr_cache_size)
+    
+    @staticmethod
+    def _iter_chunks(
+        frames: Iterable[VideoFrame],
+        scene_detector: Optional[SceneChangeDetector],
+        batch_size: Optional[int],
+        detection_cache: Optional[DetectionCache] = None
+    ) -> Iterator[List[Tuple[VideoFrame, bool, bool]]]:
+        """
+        Group frames into chunks holding up to batch_size frames to analyze.
+        
+        Yields:
+            Lists of (frame, needs_analysis, needs_inference) in frame order
+        """
+        batch_size = max(1, batch_size or settings.yolo_batch_size)
+        chunk = []
+        analyzed = 0
+        
+        for frame in frames:
+            analyze = scene_detector is None or scene_detector.should_process(frame)
+            infer = analyze and (detection_cache is None or detection_cache.needs_inference(frame))
+            if analyze:
+                # Held until the batch is full, so it must outlive decoder buffers
+                frame.detach()
+                analyzed += 1
+            else:
+                # Inherits results; only its number and timestamp travel on
+                frame.release()
+            chunk.append((frame, analyze, infer))
+            
+            if analyzed >= batch_size:
+                yield chunk
+                chunk = []
+                analyzed = 0
+        
+        if chunk:
+            yield chunk
+    
+    def analyze_frames(
+        self,
+        frames: Iterable[VideoFrame],
+        confidence_threshold: float = 0.5,
+        scene_detector: Optional[SceneChangeDetector] = None,
+        batch_size: Optional[int] = None,
+        imgsz: Optional[int] = None,
+        detection_cache: Optional[DetectionCache] = None,
+        ocr_preprocessing: Optional[str] = None,
+        ocr_rois: Optional[List] = None,
+        result_writer: Optional[ResultWriter] = None,
+        progress: Optional[ProgressReporter] = None
+    ) -> Dict:
+        """
+        Run object detection and OCR over a stream of frames.
+        
+        Decoding, detection and OCR run as pipeline stages on their own
+        threads, so they overlap instead of taking turns. The stages are
+        connected by bounded queues (PIPELINE_QUEUE_SIZE chunks,
+        OCR_QUEUE_SIZE frames), so memory stays bounded whatever the video
+        length. Decoding and detection each run on one thread; OCR runs on
+        OCR_THREADS, since Tesseract releases the GIL. Results reach the sink
+        in frame order. Text regions repeated across frames are OCR'd once
+        (see OCR_CACHE). With a result writer, the sink hands each frame's
+        results to it instead of collecting them, so they reach the database
+        in batches while the video is processed.
+        
+        Args:
+            frames: Sampled frames in timestamp order
+            confidence_threshold: YOLO confidence threshold
+            scene_detector: Skip unchanged frames and reuse previous results (optional)
+            batch_size: Frames per YOLO inference call (default from settings)
+            imgsz: YOLO inference image size (default: the model's)
+            detection_cache: Reuse detections on near-identical frames (optional)
+            ocr_preprocessing: OCR preprocessing steps (default from settings)
+            ocr_rois: Normalized areas to OCR (default: whole frames)
+            result_writer: Write results to the database as they come (optional)
+            progress: Count frames leaving the sink for the job's progress (optional)
+        
+        Returns:
+            Dictionary with detections, texts, frame counters, rows written
+            and per-stage pipeline stats; with a result writer, texts are
+            empty and detections are only returned if it keeps them
+        """
+        all_detections = []
+        all_texts = []
+        frames_processed = 0
+        frames_analyzed = 0
+        frames_inferred = 0
+        objects = Detections.empty()
+        ocr_result = None
+        ocr_cache = self.create_ocr_cache()
+        
+        def detect(chunk):
+            # Object detection, batched over the frames that need inference
+            inferred = [frame for frame, _, infer in chunk if infer]
+            batch_objects = iter(self.detect_objects_batch(
+                inferred, confidence_threshold, batch_size, imgsz
+            ))
+            return [(frame, analyze, next(batch_objects) if infer else None) for frame, analyze, infer in chunk]
+        
+        def recognize(entry):
+            frame, analyze, frame_objects = entry
+            # OCR text extraction
+            text = None
+            if analyze:
+                text = self.extract_text_ocr(
+                    frame, preprocessing=ocr_preprocessing, ocr_cache=ocr_cache, rois=ocr_rois
+                )
+            return frame, analyze, frame_objects, text
+        
+        with Pipeline() as pipeline:
+            chunks = pipeline.stage(
+                'decode',
+                self._iter_chunks(frames, scene_detector, batch_size, detection_cache),
+                queue_size=settings.pipeline_queue_size
+            )
+            detected = pipeline.stage('detect', chunks, detect, queue_size=settings.pipeline_queue_size)
+            recognized = pipeline.stage(
+                'ocr',
+                (entry for chunk in detected for entry in chunk),
+                recognize,
+                workers=settings.ocr_threads,
+                queue_size=settings.ocr_queue_size
+            )
+            
+            # In-order sink
+            try:
+                for frame, analyze, frame_objects, text in recognized:
+                    frame_num = frame.frame_number
+                    timestamp = frame.timestamp
+                    frames_processed += 1
+                    
+                    # Unchanged frames reuse the detections of the last inferred frame
+                    if frame_objects is not None:
+                        objects = frame_objects
+                        frames_inferred += 1
+                    
+                    # ...and the text of the last analyzed frame
+                    if analyze:
+                        ocr_result = text
+                        frames_analyzed += 1
+                    
+                    frame_detections = objects.with_frame(frame_num, timestamp) if len(objects) else None
+                    text_record = None
+                    if ocr_result['text']:
+                        text_record = {
+                            'frame_number': frame_num,
+                            'timestamp': timestamp,
+                            'text': ocr_result['text'],
+                            'confidence': ocr_result['confidence'],
+                            'word_count': ocr_result['word_count']
+                        }
+                    
+                    if progress is not None:
+                        progress.advance()
+                    
+                    if result_writer is not None:
+                        result_writer.add(frame_detections, text_record)
+                        if not result_writer.keep_detections:
+                            continue
+                    elif text_record:
+                        all_texts.append(text_record)
+                    
+                    if frame_detections is not None:
+                        all_detections.append(frame_detections)
+            finally:
+                # Keep the frames processed before a failure, too
+                if result_writer is not None:
+                    result_writer.flush()
+                if progress is not None:
+                    progress.flush()
+            
+            stage_stats = pipeline.stats_dict()
+        
+        return {
+            'detected_objects': Detections.concatenate(all_detections),
+            'extracted_texts': all_texts,
+            'frames_processed': frames_processed,
+            'frames_analyzed': frames_analyzed,
+            'frames_inferred': frames_inferred,
+            'inferences_saved': frames_analyzed - frames_inferred,
+            'ocr_cache_hits': ocr_cache.hits if ocr_cache else 0,
+            'ocr_cache_misses': ocr_cache.misses if ocr_cache else 0,
+            'detections_written': result_writer.detections_written if result_writer else 0,
+            'texts_written': result_writer.texts_written if result_writer else 0,
+            'pipeline_stats': stage_stats
+        }
+    
+    def analyze_segments(
+        self,
+        video_path: str,
+        frame_interval: int,
+        confidence_threshold: float,
+        sampling_mode: str,
+        frame_options: Dict,
+        workers: int,
+        batch_size: Optional[int] = None,
+        imgsz: Optional[int] = None,
+        ocr_preprocessing: Optional[str] = None,
+        ocr_rois: Optional[List] = None,
+        result_writer: Optional[ResultWriter] = None,
+        progress: Optional[ProgressReporter] = None
+    ) -> Dict:
+        """
+        Decode and analyze time ranges of a video in a process pool.
+        
+        Each segment seeks to its first frame and numbers frames on the same
+        grid as a serial run, so merged results are identical in frame numbers
+        and timestamps. In 'adaptive' mode every segment starts a new scene.
+        
+        Args:
+            video_path: Path to video file
+            frame_interval: Extract frame every N seconds
+            confidence_threshold: YOLO confidence threshold
+            sampling_mode: 'fixed' or 'adaptive'
+            frame_options: Keyword arguments for iter_frames
+            workers: Maximum number of processes
+            batch_size: Frames per YOLO inference call
+            imgsz: YOLO inference image size
+            ocr_preprocessing: OCR preprocessing steps
+            ocr_rois: Normalized areas to OCR
+            result_writer: Write results to the database as they come; each
+                segment process writes its own frames through a copy
+            progress: Job progress, which every segment process adds its frames to
+        
+        Returns:
+            Merged analyze_frames result
+        """
+        total_samples = count_sampled_frames(video_path, frame_interval)
+        min_samples = max(1, int(settings.min_segment_seconds / max(1, frame_interval)))
+        segments = plan_segments(total_samples, workers, min_samples)
+        
+        if len(segments) == 1:
+            frames = self.iter_frames(video_path, frame_interval, **frame_options)
+            return self.analyze_frames(
+                frames,
+                confidence_threshold,
+                self.create_scene_detector(sampling_mode),
+                batch_size,
+                imgsz,
+                self.create_detection_cache(),
+                ocr_preprocessing,
+                ocr_rois,
+                result_writer,
+                progress
+            )
+        
+        logger.info(f"Processing {len(segments)} segments in parallel: {segments}")
+        
+        # Segment processes load the model this process ended up with, so a backend
+        # or quantization fallback applies to them too
+        self.load_models()
+        
+        # Segment processes share the job's core budget
+        cores_per_job = plan_topology(settings.cores_per_job, settings.worker_concurrency)['cores_per_job']
+        
+        # Spawned workers load their own models instead of inheriting torch state.
+        # billiard, unlike multiprocessing, lets a Celery prefork child (a daemon
+        # process) start processes of its own
+        with billiard.get_context('spawn').Pool(
+            processes=len(segments),
+            initializer=apply_thread_limits,
+            initargs=(
+                max(1, cores_per_job // len(segments)),
+                max(1, cores_per_job // len(segments) // max(1, settings.ocr_threads))
+            )
+        ) as pool:
+            results = [
+                pool.apply_async(_analyze_segment, (
+                    video_path,
+                    frame_interval,
+                    confidence_threshold,
+                    sampling_mode,
+                    frame_options,
+                    start,
+                    stop,
+                    batch_size,
+                    imgsz,
+                    ocr_preprocessing,
+                    ocr_rois,
+                    result_writer,
+                    progress,
+                    self.detection_backend,
+                    self.quantization
+                ))
+                for start, stop in segments
+            ]
+            parts = [result.get() for result in results]
+        
+        # Segments are contiguous and ordered, so concatenation keeps timestamp order
+        merged = {
+            'detected_objects': Detections.concatenate(part['detected_objects'] for part in parts),
+            'extracted_texts': [],
+            'frames_processed': 0,
+            'frames_analyzed': 0,
+            'frames_inferred': 0,
+            'inferences_saved': 0,
+            'ocr_cache_hits': 0,
+            'ocr_cache_misses': 0,
+            'detections_written': 0,
+            'texts_written': 0
+        }
+        counters = [key for key in merged if key not in ('detected_objects', 'extracted_texts')]
+        for part in parts:
+            merged['extracted_texts'].extend(part['extracted_texts'])
+            for counter in counters:
+                merged[counter] += part[counter]
+        merged['pipeline_stats'] = merge_stage_stats([part['pipeline_stats'] for part in parts])
+        return merged
+    
     def process_video_complete(
         self,
         video_path: str,
         video_id: str,
         frame_interval: int = 1,
-        confidence_threshold: float = 0.5
+        confidence_threshold: float = 0.5,
+        sampling_mode: Optional[str] = None,
+        frame_source: Optional[str] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        imgsz: Optional[Union[int, str]] = None,
+        tracking: Optional[bool] = None,
+        ocr_preprocessing: Optional[str] = None,
+        ocr_rois: Optional[Union[str, List]] = None,
+        segment: Optional[Tuple[int, Optional[int]]] = None,
+        result_writer: Optional[ResultWriter] = None,
+        progress: Optional[ProgressReporter] = None
     ) -> Dict:
         """
         Complete video processing pipeline.
         
+        In 'adaptive' sampling mode, frames that barely differ from the last
+        analyzed frame skip YOLO and OCR and inherit its results. In
+        'keyframes' mode only the encoder's I-frames are decoded and analyzed.
+        With more than one worker, time segments are processed in parallel.
+        An inference image size gives the detector a copy of each frame
+        downscaled once, so OCR still reads full-resolution frames; 'auto'
+        picks it from the video resolution. OCR can be limited to regions of interest, given or
+        found automatically.
+        A segment limits processing to one range of sampled frames, for
+        chunked jobs that split a video between Celery tasks. A result
+        writer stores detections and texts in batches as frames are
+        processed, instead of returning them all at the end.
+        
         Args:
             video_path: Path to video file
             video_id: Unique video identifier
             frame_interval: Extract frame every N seconds
             confidence_threshold: YOLO confidence threshold
-            
+            sampling_mode: 'fixed', 'adaptive' or 'keyframes' (default from settings)
+            frame_source: 'opencv' or 'ffmpeg' decoder (default from settings)
+            workers: Number of segment processes (default from settings)
+            batch_size: Frames per YOLO inference call (default from settings)
+            imgsz: YOLO image size in pixels or 'auto' (default from settings)
+            tracking: Link detections into object tracks (default from settings)
+            ocr_preprocessing: Comma-separated OCR preprocessing steps (default from settings)
+            ocr_rois: Normalized 'x,y,w,h;...' rectangles to OCR, or 'auto' (default from settings)
+            segment: (start, stop) sampled frame numbers to process, from plan_chunks;
+                frame numbers and timestamps stay those of the whole video
+            result_writer: Write detections and texts to the database during
+                processing (optional)
+            progress: Publish stages and processed frames to Redis (optional)
+        
         Returns:
             Dictionary with all processing results
         """
         try:
-            # Create output directory for frames
-            frames_dir = os.path.join(settings.video_frames_dir, video_id)
-            Path(frames_dir).mkdir(parents=True, exist_ok=True)
+            # Frames are only written to disk when explicitly requested
+            frames_dir = None
+            if settings.save_extracted_frames:
+                frames_dir = os.path.join(settings.video_frames_dir, video_id)
             
             # Get video metadata
             metadata = self.get_video_metadata(video_path)
             
-            # Extract frames
-            frames = self.extract_frames(video_path, frames_dir, frame_interval)
+            sampling_mode = sampling_mode or settings.frame_sampling_mode
+            workers = workers or settings.processing_workers
+            if ocr_preprocessing is None:
+                ocr_preprocessing = settings.ocr_preprocessing
+            # OCR errors only blank a frame's text, so reject bad steps for the whole job here
+            parse_preprocessing(ocr_preprocessing)
+            ocr_rois = parse_rois(settings.ocr_rois if ocr_rois is None else ocr_rois)
             
-            # Process each frame
-            all_detections = []
-            all_texts = []
+            # Each frame gets a detector view downscaled once to imgsz; only DECODE_MAX_SIZE
+            # downscales the frames themselves, and with them what OCR reads
+            max_size = settings.decode_max_size or None
+            imgsz = imgsz or settings.yolo_imgsz or None
+            if imgsz:
+                imgsz = resolve_imgsz(
+                    imgsz, metadata.get('width', 0), metadata.get('height', 0), settings.min_object_size
+                )
+                logger.info(f"Running detection at image size {imgsz}")
             
-            for frame_num, frame_path, timestamp in frames:
-                # Object detection
-                objects = self.detect_objects(frame_path, confidence_threshold)
-                for obj in objects:
-                    obj['frame_number'] = frame_num
-                    obj['timestamp'] = timestamp
-                    all_detections.append(obj)
-                
-                # OCR text extraction
-                ocr_result = self.extract_text_ocr(frame_path)
-                if ocr_result['text']:
-                    all_texts.append({
-                        'frame_number': frame_num,
-                        'timestamp': timestamp,
-                        'text': ocr_result['text'],
-                        'confidence': ocr_result['confidence'],
-                        'word_count': ocr_result['word_count']
-                    })
+            frame_options = {
+                'strategy': settings.frame_sampling_strategy,
+                'output_dir': frames_dir,
+                'source': frame_source or settings.frame_source,
+                'max_size': max_size,
+                'sampling_mode': 'keyframes' if sampling_mode == 'keyframes' else 'fixed',
+                'keyframe_min_spacing': settings.keyframe_min_spacing
+            }
+            
+            if ocr_rois == 'auto':
+                if progress is not None:
+                    progress.set_stage('finding_text_regions')
+                ocr_rois = self.find_ocr_rois(
+                    video_path, metadata.get('duration', 0), frame_options['source'], max_size
+                )
+            
+            # Process each frame straight from the decoder
+            if progress is not None:
+                progress.set_stage('analyzing')
+            if segment is not None:
+                if sampling_mode == 'keyframes':
+                    raise ValueError("Segments can't be decoded in 'keyframes' sampling mode")
+                start, stop = segment
+                frames = self.iter_frames(video_path, frame_interval, start=start, stop=stop, **frame_options)
+                analysis = self.analyze_frames(
+                    frames, confidence_threshold, self.create_scene_detector(sampling_mode), batch_size,
+                    imgsz, self.create_detection_cache(), ocr_preprocessing, ocr_rois,
+                    result_writer, progress
+                )
+            elif workers > 1 and sampling_mode != 'keyframes':
+                analysis = self.analyze_segments(
+                    video_path,
+                    frame_interval,
+                    confidence_threshold,
+                    sampling_mode,
+                    frame_options,
+                    workers,
+                    batch_size,
+                    imgsz,
+                    ocr_preprocessing,
+                    ocr_rois,
+                    result_writer,
+                    progress
+                )
+            else:
+                scene_detector = self.create_scene_detector(sampling_mode)
+                frames = self.iter_frames(video_path, frame_interval, **frame_options)
+                analysis = self.analyze_frames(
+                    frames, confidence_threshold, scene_detector, batch_size, imgsz,
+                    self.create_detection_cache(), ocr_preprocessing, ocr_rois, result_writer, progress
+                )
+            
+            logger.info(
+                f"Analyzed {analysis['frames_analyzed']} of "
+                f"{analysis['frames_processed']} sampled frames, "
+                f"ran detection on {analysis['frames_inferred']} "
+                f"({analysis['inferences_saved']} inferences saved by the detection cache), "
+                f"OCR cache {analysis['ocr_cache_hits']} hits / {analysis['ocr_cache_misses']} misses"
+            )
+            for name, stage in analysis['pipeline_stats'].items():
+                logger.info(
+                    f"Stage {name}: {stage['items']} items, {stage['busy_seconds']}s busy "
+                    f"on {stage['workers']} workers, queue depth mean {stage['mean_queue_depth']} "
+                    f"/ max {stage['max_queue_depth']} of {stage['queue_size']}"
+                )
+            
+            object_tracks = []
+            if settings.object_tracking if tracking is None else tracking:
+                if progress is not None:
+                    progress.set_stage('tracking')
+                object_tracks = track_detections(
+                    analysis['detected_objects'],
+                    settings.tracking_iou_threshold,
+                    settings.tracking_max_gap
+                )
             
             return {
                 'status': 'completed',
                 'metadata': metadata,
-                'total_frames_processed': len(frames),
-                'detected_objects': all_detections,
-                'extracted_texts': all_texts,
+                'total_frames_processed': analysis['frames_processed'],
+                'frames_analyzed': analysis['frames_analyzed'],
+                'frames_inferred': analysis['frames_inferred'],
+                'inferences_saved': analysis['inferences_saved'],
+                'ocr_cache_hits': analysis['ocr_cache_hits'],
+                'ocr_cache_misses': analysis['ocr_cache_misses'],
+                'results_written': result_writer is not None,
+                'detections_written': analysis['detections_written'],
+                'texts_written': analysis['texts_written'],
+                'pipeline_stats': analysis['pipeline_stats'],
+                'detected_objects': analysis['detected_objects'],
+                'object_tracks': object_tracks,
+                'extracted_texts': analysis['extracted_texts'],
                 'error': None
             }
-            
+        
         except Exception as e:
             logger.error(f"Video processing failed: {str(e)}")
             return {
                 'status': 'failed',
                 'error': str(e),
-                'detected_objects': [],
+                'detected_objects': Detections.empty(),
+                'object_tracks': [],
                 'extracted_texts': []
             }
     
+    @staticmethod
+    def plan_chunks(video_path: str, frame_interval: int = 1) -> List[Tuple[int, Optional[int]]]:
+        """
+        Split a video into segments of about chunk_seconds for chunked jobs.
+        
+        Returns:
+            (start, stop) sampled frame ranges, as in plan_segments
+        """
+        chunk_samples = max(1, int(settings.chunk_seconds / max(1, frame_interval)))
+        total_samples = count_sampled_frames(video_path, frame_interval)
+        chunks = (total_samples + chunk_samples - 1) // chunk_samples
+        return plan_segments(total_samples, chunks, chunk_samples)
+    
     @staticmethod
     def cleanup_frames(video_id: str):
         """Clean up extracted frames for a video."""
@@ -319,5 +1016,54 @@ class VideoProcessingService:
             logger.error(f"Failed to cleanup frames: {str(e)}")
 
 
-# Singleton instance
+def _analyze_segment(
+    video_path: str,
+    frame_interval: int,
+    confidence_threshold: float,
+    sampling_mode: str,
+    frame_options: Dict,
+    start: int,
+    stop: Optional[int],
+    batch_size: Optional[int] = None,
+    imgsz: Optional[int] = None,
+    ocr_preprocessing: Optional[str] = None,
+    ocr_rois: Optional[List] = None,
+    result_writer: Optional[ResultWriter] = None,
+    progress: Optional[ProgressReporter] = None,
+    detection_backend: Optional[str] = None,
+    quantization: Optional[str] = None
+) -> Dict:
+    """Process pool entry point: analyze one segment with the parent's detection backend."""
+    service = _segment_service(detection_backend, quantization)
+    frames = service.iter_frames(
+        video_path, frame_interval, start=start, stop=stop, **frame_options
+    )
+    return service.analyze_frames(
+        frames,
+        confidence_threshold,
+        service.create_scene_detector(sampling_mode),
+        batch_size,
+        imgsz,
+        service.create_detection_cache(),
+        ocr_preprocessing,
+        ocr_rois,
+        result_writer,
+        progress
+    )
+
+
+# Singleton instance (models load on first use)
 video_service = VideoProcessingService()
+
+# Services of segment processes whose parent resolved a different backend than the settings
+_segment_services: Dict[Tuple[str, str], VideoProcessingService] = {}
+
+
+def _segment_service(detection_backend: Optional[str], quantization: Optional[str]) -> VideoProcessingService:
+    """This process's service for a backend and quantization, loading its model once."""
+    key = (detection_backend or video_service.detection_backend, quantization or video_service.quantization)
+    if key == (video_service.detection_backend, video_service.quantization):
+        return video_service
+    if key not in _segment_services:
+        _segment_services[key] = VideoProcessingService(*key)
+    return _segment_services[key]
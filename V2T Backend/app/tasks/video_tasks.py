@@ -1,17 +1,176 @@
 import os
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from app.core.celery_app import celery_app
+from celery import chord
+from celery.signals import worker_process_init
+from app.core.celery_app import celery_app, topology
+from app.core.worker_topology import apply_thread_limits, pin_to_cores
 from app.services.video_processing import video_service
-from app.models.video import Video, DetectedObject, ExtractedText, VideoStatus
+from app.services.detections import Detections
+from app.services.tracking import track_detections
+from app.services.pipeline import merge_stage_stats
+from app.services.result_writer import ResultWriter
+from app.services.progress import ProgressReporter
+from app.services.frame_sources import count_sampled_frames
+from app.services.text_regions import parse_rois
+from app.models.video import Video, DetectedObject, ObjectTrack, ExtractedText, VideoStatus
 from app.core.database import SessionLocal
+from app.core.config import settings
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(bind=True, name='process_video')
-def process_video_task(self, video_id: str, video_path: str, frame_interval: int = 1):
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Apply the core budget, then load and warm up models once per worker process."""
+    cores = []
+    if settings.worker_cpu_affinity:
+        from billiard.process import current_process
+        cores = pin_to_cores(current_process().index or 0, topology['cores_per_job'])
+    apply_thread_limits(topology['torch_threads'], topology['omp_thread_limit'])
+    
+    logger.info(
+        f"Worker process {os.getpid()}: {topology['torch_threads']} threads"
+        + (f", pinned to cores {cores}" if cores else "")
+    )
+    video_service.warm_up()
+
+
+def _save_results(db: Session, video: Video, result: Dict, save_frame_detections: bool) -> Dict:
+    """
+    Store a completed process_video_complete result and mark the video completed.
+    
+    Detections and texts a result writer stored during processing are not
+    written again; only tracks, metadata and the status remain.
+    """
+    video_id = video.video_id
+    objects_detected = len(result['detected_objects'])
+    texts_extracted = len(result['extracted_texts'])
+    
+    # Save metadata
+    metadata = result.get('metadata', {})
+    video.duration = metadata.get('duration')
+    video.fps = metadata.get('fps')
+    
+    if result.get('results_written'):
+        # Detections are only kept in memory when tracking needs them
+        objects_detected = objects_detected or result['detections_written']
+        texts_extracted = result['texts_written']
+    else:
+        # Save detected objects straight from the detection arrays
+        if save_frame_detections or not result['object_tracks']:
+            db.bulk_insert_mappings(DetectedObject, result['detected_objects'].to_records(video_id))
+        
+        # Save extracted texts
+        for text_data in result['extracted_texts']:
+            extracted_text = ExtractedText(
+                video_id=video_id,
+                frame_number=text_data['frame_number'],
+                timestamp=text_data['timestamp'],
+                text_content=text_data['text'],
+                confidence=text_data.get('confidence')
+            )
+            db.add(extracted_text)
+    
+    # Save object tracks, one row per tracked object
+    db.bulk_insert_mappings(
+        ObjectTrack, [dict(track, video_id=video_id) for track in result['object_tracks']]
+    )
+    
+    # Update video status
+    video.status = VideoStatus.COMPLETED
+    video.completed_at = datetime.utcnow()
+    db.commit()
+    ProgressReporter(video_id).finish()
+    
+    logger.info(
+        f"Video processing completed for {video_id} "
+        f"(OCR cache: {result['ocr_cache_hits']} hits, {result['ocr_cache_misses']} misses)"
+    )
+    
+    return {
+        'status': 'completed',
+        'video_id': video_id,
+        'total_frames': result['total_frames_processed'],
+        'frames_inferred': result['frames_inferred'],
+        'inferences_saved': result['inferences_saved'],
+        'ocr_cache_hits': result['ocr_cache_hits'],
+        'ocr_cache_misses': result['ocr_cache_misses'],
+        'pipeline_stats': result['pipeline_stats'],
+        'objects_detected': objects_detected,
+        'object_tracks': len(result['object_tracks']),
+        'texts_extracted': texts_extracted
+    }
+
+
+def _create_writer(video_id: str, options: Dict, save_frame_detections: bool) -> Optional[ResultWriter]:
+    """Result writer for a job, or None if results are written at the end (RESULT_BATCH_FRAMES=0)."""
+    if settings.result_batch_frames <= 0:
+        return None
+    tracking = settings.object_tracking if options.get('tracking') is None else options['tracking']
+    return ResultWriter(
+        video_id,
+        settings.result_batch_frames,
+        save_detections=save_frame_detections or not tracking,
+        keep_detections=tracking
+    )
+
+
+def _mark_failed(video_id: str, error: str):
+    """Set a video's status to failed in a fresh session."""
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.video_id == video_id).first()
+        if video:
+            video.status = VideoStatus.FAILED
+            video.error_message = error
+            db.commit()
+    finally:
+        db.close()
+    ProgressReporter(video_id).finish()
+
+
+def _dispatch_chunks(
+    video_id: str,
+    video_path: str,
+    frame_interval: int,
+    chunks: List[Tuple[int, Optional[int]]],
+    options: Dict,
+    save_frame_detections: bool
+) -> Dict:
+    """Queue one subtask per chunk, with a merge task that runs when all have finished."""
+    # Find automatic OCR bands once, so every chunk reads the same regions
+    if parse_rois(settings.ocr_rois if options.get('ocr_rois') is None else options['ocr_rois']) == 'auto':
+        metadata = video_service.get_video_metadata(video_path)
+        bands = video_service.find_ocr_rois(
+            video_path,
+            metadata.get('duration', 0),
+            options.get('frame_source') or settings.frame_source,
+            settings.decode_max_size or None
+        )
+        options['ocr_rois'] = [list(band) for band in bands] if bands else ''
+    
+    options = dict(options, save_frame_detections=save_frame_detections)
+    header = [
+        process_video_segment_task.s(video_id, video_path, frame_interval, start, stop, options)
+        for start, stop in chunks
+    ]
+    merge = merge_video_segments_task.s(video_id, options)
+    chord(header)(merge.on_error(mark_video_failed_task.s(video_id)))
+    
+    logger.info(f"Dispatched {len(chunks)} chunks for video {video_id}: {chunks}")
+    return {'status': 'dispatched', 'video_id': video_id, 'chunks': len(chunks)}
+
+
+@celery_app.task(name='process_video')
+def process_video_task(
+    video_id: str,
+    video_path: str,
+    frame_interval: int = 1,
+    options: Optional[Dict] = None
+):
     """
     Celery task to process video asynchronously.
     
@@ -19,7 +178,17 @@ def process_video_task(self, video_id: str, video_path: str, frame_interval: int
         video_id: Unique video identifier
         video_path: Path to the uploaded video
         frame_interval: Extract frame every N seconds
+        options: Per-job overrides passed to process_video_complete,
+            e.g. {'frame_source': 'ffmpeg', 'sampling_mode': 'adaptive'}.
+            'save_frame_detections' and 'chunked' override the settings of the
+            same name. Chunked jobs hand the video to process_video_segment
+            subtasks and merge_video_segments, which completes the video.
     """
+    options = dict(options or {})
+    save_frame_detections = options.pop('save_frame_detections', settings.save_frame_detections)
+    chunked = options.pop('chunked', settings.chunked_processing)
+    progress = ProgressReporter(video_id)
+    
     db = SessionLocal()
     
     try:
@@ -27,79 +196,52 @@ def process_video_task(self, video_id: str, video_path: str, frame_interval: int
         video = db.query(Video).filter(Video.video_id == video_id).first()
         if not video:
             logger.error(f"Video {video_id} not found in database")
+            progress.finish()
             return {'status': 'failed', 'error': 'Video not found'}
         
         video.status = VideoStatus.PROCESSING
         db.commit()
         
+        # Results are written as they come, so drop those of an interrupted earlier run
+        if settings.result_batch_frames > 0:
+            ResultWriter.clear(video_id)
+        
         logger.info(f"Starting video processing for {video_id}")
         
-        # Update task state
-        self.update_state(state='PROCESSING', meta={'progress': 10, 'status': 'Extracting frames'})
+        # Progress goes to Redis, so status polls don't query the database while the job runs
+        keyframes = (options.get('sampling_mode') or settings.frame_sampling_mode) == 'keyframes'
+        progress.start(0 if keyframes else count_sampled_frames(video_path, frame_interval))
+        
+        # Keyframe positions aren't known up front, so keyframe jobs always run in one task
+        if chunked and not keyframes:
+            chunks = video_service.plan_chunks(video_path, frame_interval)
+            if len(chunks) > 1:
+                return _dispatch_chunks(
+                    video_id, video_path, frame_interval, chunks, options, save_frame_detections
+                )
         
         # Process video
         result = video_service.process_video_complete(
             video_path=video_path,
             video_id=video_id,
             frame_interval=frame_interval,
-            confidence_threshold=0.5
+            confidence_threshold=0.5,
+            result_writer=_create_writer(video_id, options, save_frame_detections),
+            progress=progress,
+            **options
         )
         
         if result['status'] == 'failed':
             video.status = VideoStatus.FAILED
             video.error_message = result.get('error', 'Unknown error')
             db.commit()
+            progress.finish()
             return result
         
-        # Update task state
-        self.update_state(state='PROCESSING', meta={'progress': 50, 'status': 'Saving results'})
-        
-        # Save metadata
-        metadata = result.get('metadata', {})
-        video.duration = metadata.get('duration')
-        video.fps = metadata.get('fps')
-        
-        # Save detected objects
-        for obj_data in result['detected_objects']:
-            detected_obj = DetectedObject(
-                video_id=video_id,
-                frame_number=obj_data['frame_number'],
-                timestamp=obj_data['timestamp'],
-                object_class=obj_data['class'],
-                confidence=obj_data['confidence'],
-                bbox_x1=obj_data['bbox']['x1'],
-                bbox_y1=obj_data['bbox']['y1'],
-                bbox_x2=obj_data['bbox']['x2'],
-                bbox_y2=obj_data['bbox']['y2']
-            )
-            db.add(detected_obj)
-        
-        # Save extracted texts
-        for text_data in result['extracted_texts']:
-            extracted_text = ExtractedText(
-                video_id=video_id,
-                frame_number=text_data['frame_number'],
-                timestamp=text_data['timestamp'],
-                text_content=text_data['text'],
-                confidence=text_data.get('confidence')
-            )
-            db.add(extracted_text)
-        
-        # Update video status
-        video.status = VideoStatus.COMPLETED
-        video.completed_at = datetime.utcnow()
-        db.commit()
-        
-        logger.info(f"Video processing completed for {video_id}")
-        
-        return {
-            'status': 'completed',
-            'video_id': video_id,
-            'total_frames': result['total_frames_processed'],
-            'objects_detected': len(result['detected_objects']),
-            'texts_extracted': len(result['extracted_texts'])
-        }
+        progress.set_stage('saving')
         
+        return _save_results(db, video, result, save_frame_detections)
+    
     except Exception as e:
         logger.error(f"Error processing video {video_id}: {str(e)}")
         
@@ -112,6 +254,7 @@ def process_video_task(self, video_id: str, video_path: str, frame_interval: int
                 db.commit()
         except:
             pass
+        progress.finish()
         
         return {
             'status': 'failed',
@@ -120,3 +263,115 @@ def process_video_task(self, video_id: str, video_path: str, frame_interval: int
     
     finally:
         db.close()
+
+
+@celery_app.task(name='process_video_segment')
+def process_video_segment_task(
+    video_id: str,
+    video_path: str,
+    frame_interval: int,
+    start: int,
+    stop: Optional[int],
+    options: Optional[Dict] = None
+) -> Dict:
+    """
+    Analyze one chunk of a chunked job.
+    
+    Tracking waits for the merge, since tracks cross chunk boundaries.
+    Detections and texts are written to the database as the chunk runs,
+    unless RESULT_BATCH_FRAMES is 0.
+    
+    Returns:
+        JSON-serializable process_video_complete result for the chunk
+    """
+    options = dict(options or {})
+    save_frame_detections = options.pop('save_frame_detections', settings.save_frame_detections)
+    result_writer = _create_writer(video_id, options, save_frame_detections)
+    
+    logger.info(f"Processing frames {start}-{stop if stop is not None else 'end'} of video {video_id}")
+    result = video_service.process_video_complete(
+        video_path=video_path,
+        video_id=video_id,
+        frame_interval=frame_interval,
+        confidence_threshold=0.5,
+        segment=(start, stop),
+        result_writer=result_writer,
+        progress=ProgressReporter(video_id),
+        **dict(options, tracking=False)
+    )
+    result['detected_objects'] = result['detected_objects'].to_dict()
+    result['segment'] = [start, stop]
+    return result
+
+
+@celery_app.task(name='merge_video_segments')
+def merge_video_segments_task(results: List[Dict], video_id: str, options: Optional[Dict] = None) -> Dict:
+    """
+    Stitch the chunk results of a chunked job and complete the video.
+    
+    Chunks number frames on the whole video's grid, so their results are
+    concatenated in chunk order, and object tracks are built over the
+    merged detections with ids numbered across the whole video.
+    """
+    options = dict(options or {})
+    save_frame_detections = options.pop('save_frame_detections', settings.save_frame_detections)
+    
+    ProgressReporter(video_id).set_stage('merging')
+    
+    failed = [result for result in results if result['status'] == 'failed']
+    if failed:
+        logger.error(f"{len(failed)} of {len(results)} chunks of video {video_id} failed")
+        _mark_failed(video_id, failed[0].get('error') or 'Unknown error')
+        return {'status': 'failed', 'error': failed[0].get('error')}
+    
+    results = sorted(results, key=lambda result: result['segment'][0])
+    detected_objects = Detections.concatenate(
+        Detections.from_dict(result['detected_objects']) for result in results
+    )
+    
+    object_tracks = []
+    if settings.object_tracking if options.get('tracking') is None else options['tracking']:
+        object_tracks = track_detections(
+            detected_objects, settings.tracking_iou_threshold, settings.tracking_max_gap
+        )
+    
+    merged = {
+        'metadata': results[0]['metadata'],
+        'detected_objects': detected_objects,
+        'object_tracks': object_tracks,
+        'extracted_texts': [text for result in results for text in result['extracted_texts']],
+        'pipeline_stats': merge_stage_stats([result['pipeline_stats'] for result in results])
+    }
+    for counter in (
+        'total_frames_processed', 'frames_analyzed', 'frames_inferred', 'inferences_saved',
+        'ocr_cache_hits', 'ocr_cache_misses', 'detections_written', 'texts_written'
+    ):
+        merged[counter] = sum(result[counter] for result in results)
+    merged['results_written'] = all(result['results_written'] for result in results)
+    
+    db = SessionLocal()
+    try:
+        video = db.query(Video).filter(Video.video_id == video_id).first()
+        if not video:
+            logger.error(f"Video {video_id} not found in database")
+            return {'status': 'failed', 'error': 'Video not found'}
+        
+        result = _save_results(db, video, merged, save_frame_detections)
+        result['chunks'] = len(results)
+        return result
+    
+    except Exception as e:
+        logger.error(f"Error merging chunks of video {video_id}: {str(e)}")
+        db.rollback()
+        _mark_failed(video_id, str(e))
+        return {'status': 'failed', 'error': str(e)}
+    
+    finally:
+        db.close()
+
+
+@celery_app.task(name='mark_video_failed')
+def mark_video_failed_task(request, exc, traceback, video_id: str):
+    """Error callback of a chunked job: a chunk or the merge raised, or hit the time limit."""
+    logger.error(f"Chunked processing of video {video_id} failed: {str(exc)}")
+    _mark_failed(video_id, str(exc))
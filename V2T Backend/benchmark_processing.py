@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the V2T video processing pipeline
+
+Usage:
+    python benchmark_processing.py decode path/to/video.mp4 [--interval 1] [--max-size 640]
+    python benchmark_processing.py detect path/to/video.mp4 [--backends pytorch onnx] [--frames 64]
+    python benchmark_processing.py quantize path/to/video.mp4 [--calibration path/to/frames] [--rebuild]
+    python benchmark_processing.py ocr path/to/video.mp4 [--pipelines "" normalize,binarize] [--frames 32]
+"""
+
+import argparse
+import difflib
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.frame_sources import FRAME_SOURCES, SAMPLING_STRATEGIES, create_frame_source
+from app.core.config import settings
+from app.services.detection_backends import (
+    DETECTION_BACKENDS, QUANTIZATION_MODES, compare_detections, quantized_model_path
+)
+from app.services.ocr_preprocessing import parse_preprocessing
+from app.services.video_processing import VideoProcessingService
+
+
+def print_header(text):
+    print("\n" + "="*60)
+    print(f"  {text}")
+    print("="*60)
+
+
+def time_frames(frames):
+    """Consume a frame source and return (frame_count, seconds)."""
+    start = time.perf_counter()
+    count = 0
+    for frame in frames:
+        count += 1
+    return count, time.perf_counter() - start
+
+
+def benchmark_decode(args):
+    """Compare frame sources on the same clip."""
+    print_header(f"Frame decoding: {args.video}")
+    print(f"Interval: {args.interval}s, max size: {args.max_size or 'source'}\n")
+    
+    runs = [('opencv', strategy, 'fixed') for strategy in SAMPLING_STRATEGIES]
+    runs += [(source, None, 'fixed') for source in FRAME_SOURCES if source != 'opencv']
+    runs += [('ffmpeg', None, 'keyframes')]
+    
+    print(f"{'Source':<20}{'Frames':>10}{'Seconds':>12}{'Frames/s':>12}")
+    for source, strategy, mode in runs:
+        frames = create_frame_source(
+            args.video,
+            args.interval,
+            source=source,
+            strategy=strategy or 'auto',
+            max_size=args.max_size,
+            sampling_mode=mode
+        )
+        count, seconds = time_frames(frames)
+        label = f"{source}/{strategy}" if strategy else source
+        if mode != 'fixed':
+            label = mode
+        print(f"{label:<20}{count:>10}{seconds:>12.2f}{count / seconds if seconds else 0:>12.1f}")
+
+
+def load_frames(args):
+    """Decode the first --frames sampled frames of the clip into memory."""
+    source = create_frame_source(args.video, args.interval, max_size=args.max_size)
+    frames = []
+    for frame in source:
+        frames.append(frame.detach())
+        if len(frames) >= args.frames:
+            break
+    return frames
+
+
+def time_detection(label, service, frames, args, reference=None):
+    """Print frames/s of one model, with parity against reference detections if given."""
+    service.warm_up()
+    if service.yolo_model is None:
+        print(f"{label:<16}{'unavailable':>12}")
+        return None
+    
+    start = time.perf_counter()
+    detections = service.detect_objects_batch(frames, args.confidence, args.batch_size)
+    elapsed = time.perf_counter() - start
+    
+    line = f"{label:<16}{len(frames) / elapsed:>12.1f}"
+    if reference is not None:
+        parity = compare_detections(reference, detections)
+        line += (
+            f"  recall {parity['recall']:.3f}  precision {parity['precision']:.3f}"
+            f"  IoU {parity['mean_iou']:.3f}  conf delta {parity['mean_confidence_delta']:.3f}"
+        )
+    print(line)
+    return detections
+
+
+def benchmark_detect(args):
+    """Run the same frames through each detection backend and check parity with PyTorch."""
+    frames = load_frames(args)
+    print_header(f"Detection: {args.video} ({len(frames)} frames)")
+    print(f"{'Backend':<16}{'Frames/s':>12}")
+    
+    # Parity is always checked against PyTorch, so it runs first
+    reference = time_detection('pytorch', VideoProcessingService('pytorch', 'none'), frames, args)
+    for backend in args.backends:
+        if backend == 'pytorch':
+            continue
+        service = VideoProcessingService(backend, 'none')
+        service.load_models()
+        if service.detection_backend != backend:
+            print(f"{backend:<16}{'unavailable':>12}")
+            continue
+        time_detection(backend, service, frames, args, reference)
+
+
+def benchmark_quantize(args):
+    """Compare INT8 models with the FP32 ONNX model for accuracy and speed."""
+    settings.quantization_calibration_path = args.calibration or args.video
+    settings.quantization_calibration_frames = args.calibration_frames
+    if args.rebuild:
+        for mode in QUANTIZATION_MODES:
+            quantized_model_path(settings.yolo_weights, mode).unlink(missing_ok=True)
+    
+    frames = load_frames(args)
+    print_header(f"INT8 quantization: {args.video} ({len(frames)} frames)")
+    print(f"Calibration: {settings.quantization_calibration_path} ({args.calibration_frames} frames)\n")
+    print(f"{'Model':<16}{'Frames/s':>12}")
+    
+    reference = time_detection('fp32 onnx', VideoProcessingService('onnx', 'none'), frames, args)
+    for mode in QUANTIZATION_MODES:
+        if mode == 'none':
+            continue
+        service = VideoProcessingService('onnx', mode)
+        service.load_models()
+        if service.quantization != mode:
+            print(f"{'int8 ' + mode:<16}{'unavailable':>12}")
+            continue
+        time_detection(f"int8 {mode}", service, frames, args, reference)
+
+
+def word_agreement(reference, candidate):
+    """Share of words two OCR readings of the same frame have in common, in order (0-1)."""
+    reference, candidate = reference.split(), candidate.split()
+    if not reference and not candidate:
+        return 1.0
+    return difflib.SequenceMatcher(None, reference, candidate, autojunk=False).ratio()
+
+
+def benchmark_ocr(args):
+    """Time OCR preprocessing pipelines and compare their text with the first pipeline."""
+    frames = load_frames(args)
+    print_header(f"OCR preprocessing: {args.video} ({len(frames)} frames)")
+    print(f"Agreement is word-level, against '{args.pipelines[0] or 'none'}'\n")
+    print(f"{'Pipeline':<36}{'ms/frame':>10}{'Words':>8}{'Agreement':>11}")
+    
+    service = VideoProcessingService()
+    reference = None
+    for pipeline in args.pipelines:
+        pipeline = ','.join(parse_preprocessing(pipeline))
+        start = time.perf_counter()
+        texts = [service.extract_text_ocr(frame, preprocessing=pipeline)['text'] for frame in frames]
+        elapsed = time.perf_counter() - start
+        
+        if reference is None:
+            reference = texts
+        agreement = sum(map(word_agreement, reference, texts)) / len(texts) if texts else 0
+        words = sum(len(text.split()) for text in texts)
+        print(
+            f"{pipeline or 'none':<36}{elapsed * 1000 / max(1, len(frames)):>10.1f}"
+            f"{words:>8}{agreement:>11.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark V2T video processing stages")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    decode = subparsers.add_parser("decode", help="Compare frame decoders")
+    decode.add_argument("video", help="Path to a video file")
+    decode.add_argument("--interval", type=int, default=1, help="Sample one frame every N seconds")
+    decode.add_argument("--max-size", type=int, default=None, help="Downscale to this longest side")
+    decode.set_defaults(func=benchmark_decode)
+    
+    detect = subparsers.add_parser("detect", help="Compare detection backends")
+    detect.add_argument(
+        "--backends", nargs="+", choices=list(DETECTION_BACKENDS), default=list(DETECTION_BACKENDS),
+        help="Backends to compare; PyTorch always runs as the parity reference"
+    )
+    detect.set_defaults(func=benchmark_detect)
+    
+    quantize = subparsers.add_parser("quantize", help="Compare INT8 models with the FP32 model")
+    quantize.add_argument("--calibration", default=None, help="Calibration video or image directory (default: the clip)")
+    quantize.add_argument("--calibration-frames", type=int, default=100, help="Frames used for static calibration")
+    quantize.add_argument("--rebuild", action="store_true", help="Re-quantize instead of using cached INT8 models")
+    quantize.set_defaults(func=benchmark_quantize)
+    
+    ocr = subparsers.add_parser("ocr", help="Compare OCR preprocessing pipelines")
+    ocr.add_argument(
+        "--pipelines", nargs="+",
+        default=["", "normalize", "normalize,binarize", "normalize,denoise,deskew,binarize"],
+        help="Comma-separated preprocessing steps per run; the first is the agreement reference"
+    )
+    ocr.set_defaults(func=benchmark_ocr)
+    
+    for command in (detect, quantize, ocr):
+        command.add_argument("video", help="Path to a video file")
+        command.add_argument("--frames", type=int, default=64, help="Frames run through each model")
+        command.add_argument("--interval", type=int, default=1, help="Sample one frame every N seconds")
+        command.add_argument("--max-size", type=int, default=None, help="Downscale to this longest side")
+    for command in (detect, quantize):
+        command.add_argument("--confidence", type=float, default=0.5, help="Minimum detection confidence")
+        command.add_argument("--batch-size", type=int, default=None, help="Frames per inference call")
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the frame grid of the OpenCV and ffmpeg frame sources.
+
+Writes short clips whose frames encode their own index as black and white
+bars, then checks that FFmpegFrameSource yields the same source frames,
+frame numbers and timestamps as OpenCVFrameSource, and that segments
+decoded one after another join up to the same frames as a serial run.
+
+Usage: python test_frame_sources.py
+Needs ffmpeg and ffprobe on the PATH.
+"""
+
+import os
+import sys
+import subprocess
+import tempfile
+import numpy as np
+
+from app.services.frame_sources import OpenCVFrameSource, FFmpegFrameSource, plan_segments
+
+BITS = 11
+BAR_WIDTH = 16
+
+# (frame rate, frame count): integer and NTSC rates
+CLIPS = [("30", 400), ("30000/1001", 1260)]
+INTERVALS = [1, 3]
+
+
+def write_clip(path, rate, count):
+    """Encode count frames losslessly, each showing its index in binary."""
+    width, height = BITS * BAR_WIDTH, 64
+    process = subprocess.Popen(
+        [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", rate, "-i", "-",
+            "-c:v", "libx264", "-qp", "0", "-bf", "2", "-g", "60", "-pix_fmt", "yuv444p", path
+        ],
+        stdin=subprocess.PIPE
+    )
+    for index in range(count):
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        for bit in range(BITS):
+            if index >> bit & 1:
+                frame[:, bit * BAR_WIDTH:(bit + 1) * BAR_WIDTH] = 255
+        process.stdin.write(frame.tobytes())
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed to write {path}")
+
+
+def source_index(image):
+    """Read back the index a frame was encoded with."""
+    return sum(
+        1 << bit for bit in range(BITS)
+        if image[:, bit * BAR_WIDTH + 4:(bit + 1) * BAR_WIDTH - 4].mean() > 127
+    )
+
+
+def sample(source):
+    """(frame number, source frame index, timestamp) of every frame a source yields."""
+    return [
+        (frame.frame_number, source_index(frame.image), round(frame.timestamp, 4))
+        for frame in source
+    ]
+
+
+def test_frame_sources():
+    """Compare the ffmpeg frame grid with OpenCV's, serially and in segments"""
+    
+    print("=" * 70)
+    print("  V2T Backend - Frame Source Grid Test")
+    print("=" * 70)
+    print()
+    
+    passed = True
+    with tempfile.TemporaryDirectory() as directory:
+        for rate, count in CLIPS:
+            path = os.path.join(directory, f"clip_{rate.replace('/', '_')}.mp4")
+            write_clip(path, rate, count)
+            
+            for interval in INTERVALS:
+                print(f"{rate} fps, {count} frames, one frame every {interval}s:")
+                expected = sample(OpenCVFrameSource(path, interval, strategy='grab'))
+                
+                serial = sample(FFmpegFrameSource(path, interval))
+                same = serial == expected
+                passed = passed and same
+                print(f"   {'✅' if same else '❌'} serial: {len(serial)} frames (OpenCV: {len(expected)})")
+                if not same:
+                    mismatches = [(got, want) for got, want in zip(serial, expected) if got != want]
+                    print(f"      first mismatches (ffmpeg, OpenCV): {mismatches[:3]}")
+                
+                for workers in (3, len(expected)):
+                    segments = plan_segments(len(expected), workers)
+                    joined = [
+                        frame
+                        for start, stop in segments
+                        for frame in sample(FFmpegFrameSource(path, interval, start=start, stop=stop))
+                    ]
+                    same = joined == expected
+                    passed = passed and same
+                    print(f"   {'✅' if same else '❌'} {len(segments)} segments joined: {len(joined)} frames")
+                print()
+    
+    print("=" * 70)
+    print(f"  Frame Source Grid Test {'Passed' if passed else 'Failed'}")
+    print("=" * 70)
+    
+    return passed
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(0 if test_frame_sources() else 1)
+    except KeyboardInterrupt:
+        print("\n\n❌ Test interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
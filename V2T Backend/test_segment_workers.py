@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel segment processing inside a Celery worker process.
+
+Celery's prefork pool runs tasks in daemonic billiard processes, which the
+multiprocessing module doesn't allow to start children. This script runs
+analyze_segments from such a process, as a task would, and checks that the
+segments are processed and merged into the same result as a serial run.
+
+Usage: python test_segment_workers.py [video]
+Without a video, a short clip is written with OpenCV.
+"""
+
+import os
+import sys
+import tempfile
+import cv2
+import billiard
+import numpy as np
+
+from app.core.config import settings
+from app.services.video_processing import VideoProcessingService
+
+SEGMENT_WORKERS = 3
+CLIP_SECONDS = 12
+CLIP_FPS = 10
+
+
+def write_clip(path):
+    """Write a clip whose frames show the second they belong to."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), CLIP_FPS, (320, 240))
+    for index in range(CLIP_SECONDS * CLIP_FPS):
+        frame = np.full((240, 320, 3), 255, dtype=np.uint8)
+        cv2.putText(frame, f"SECOND {index // CLIP_FPS}", (20, 130), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 3)
+        writer.write(frame)
+    writer.release()
+
+
+def analyze(video_path, workers):
+    """Run analyze_segments with fixed sampling and return what the segments found."""
+    settings.min_segment_seconds = 1
+    result = VideoProcessingService().analyze_segments(
+        video_path, 1, 0.5, 'fixed', {'source': 'opencv'}, workers
+    )
+    return {
+        'daemon': billiard.current_process().daemon,
+        'frames_processed': result['frames_processed'],
+        'objects': len(result['detected_objects']),
+        'texts': [(text['frame_number'], text['text']) for text in result['extracted_texts']]
+    }
+
+
+def test_segment_workers(video_path=None):
+    """Compare a serial run with segments processed from a prefork-style worker"""
+    
+    print("=" * 70)
+    print("  V2T Backend - Segment Workers Test")
+    print("=" * 70)
+    print()
+    
+    if video_path is None:
+        video_path = os.path.join(tempfile.mkdtemp(), "segments.mp4")
+        write_clip(video_path)
+    
+    print("1. Analyzing serially in this process...")
+    serial = analyze(video_path, 1)
+    print(f"   {serial['frames_processed']} frames, {len(serial['texts'])} texts")
+    
+    print(f"\n2. Analyzing in {SEGMENT_WORKERS} segments from a daemonic billiard worker...")
+    with billiard.Pool(1) as pool:
+        parallel = pool.apply(analyze, (video_path, SEGMENT_WORKERS))
+    print(f"   {parallel['frames_processed']} frames, {len(parallel['texts'])} texts")
+    
+    print("\n3. Comparing results...")
+    passed = parallel['daemon']
+    print(f"   {'✅' if parallel['daemon'] else '❌'} worker process was daemonic, like a Celery child")
+    for name in ('frames_processed', 'objects', 'texts'):
+        same = serial[name] == parallel[name]
+        passed = passed and same
+        count = parallel[name] if isinstance(parallel[name], int) else len(parallel[name])
+        print(f"   {'✅' if same else '❌'} {name}: {count}")
+    
+    print("\n" + "=" * 70)
+    print(f"  Segment Workers Test {'Passed' if passed else 'Failed'}")
+    print("=" * 70)
+    
+    return passed
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(0 if test_segment_workers(sys.argv[1] if len(sys.argv) > 1 else None) else 1)
+    except KeyboardInterrupt:
+        print("\n\n❌ Test interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)